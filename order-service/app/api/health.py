@@ -1,57 +1,76 @@
 """
 Health check endpoint
 """
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi import APIRouter, Response, status
 from datetime import datetime
-import httpx
 
-from app.database import get_db
+from app.readiness import readiness
+from app.health_monitor import health_monitor
 from app.config import settings
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check():
     """
     Health check endpoint
     
     Checks:
     - Service status
     - Database connectivity
-    - Product Service connectivity
-    """
-    # Check database
-    try:
-        db.execute(text("SELECT 1"))
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
-    
-    # Check Product Service
-    try:
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            response = await client.get(f"{settings.PRODUCT_SERVICE_URL}/health")
-            if response.status_code == 200:
-                product_service_status = "healthy"
-            else:
-                product_service_status = f"unhealthy: status {response.status_code}"
-    except Exception as e:
-        product_service_status = f"unhealthy: {str(e)}"
+    - Product Service connectivity (its /ready, not its /health)
     
-    overall_status = "healthy" if (db_status == "healthy" and product_service_status == "healthy") else "unhealthy"
+    Served from the snapshot refreshed every HEALTH_CHECK_INTERVAL_SECONDS
+    (no I/O per request); checks reports each dependency's status age.
+    """
+    checks = health_monitor.snapshot()
+    overall_status = "healthy" if all(check["status"] == "healthy" for check in checks.values()) else "unhealthy"
     
     return {
         "service": settings.SERVICE_NAME,
         "status": overall_status,
-        "database": db_status,
-        "product_service": product_service_status,
+        "database": checks["database"]["status"],
+        "product_service": checks["product_service"]["status"],
+        "checks": checks,
         "timestamp": datetime.utcnow().isoformat()
     }
 
 
+@router.get("/live")
+def liveness():
+    """
+    Liveness probe
+    
+    The process is up and serving requests; no dependencies are checked,
+    so an outage of the database, RabbitMQ or Product Service does not get
+    the container restarted.
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+def readiness_probe(response: Response):
+    """
+    Readiness probe
+    
+    200 once the warm-up checks have passed (database migrated to this
+    build's revision, pooled connections open, RabbitMQ reachable), 503
+    until then. Failed checks are retried on every call; passed checks are
+    not repeated, so a ready process answers without any I/O. Product
+    Service is not checked: its outage must not take this service out of
+    rotation.
+    """
+    ready = readiness.run()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "service": settings.SERVICE_NAME,
+        "status": "ready" if ready else "not ready",
+        "checks": readiness.status()
+    }
+
+
 @router.get("/")
 def root():
     """Root endpoint"""
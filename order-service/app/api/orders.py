@@ -3,10 +3,12 @@ Order API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
-from app.services.order_service import OrderService
+from app.api.responses import FastJSONResponse
+from app.services.order_service import OrderService, ORDER_FIELDS
+from app.services.fieldsets import InvalidFieldsError, parse_fields
 from app.schemas.order import (
     OrderCreate,
     OrderStatusUpdate,
@@ -26,6 +28,7 @@ def get_order_service(db: Session = Depends(get_db)) -> OrderService:
 def get_orders(
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of orders to return"),
+    fields: Optional[str] = Query(None, max_length=500, description="Comma-separated fields to return (default: all)"),
     service: OrderService = Depends(get_order_service)
 ):
     """
@@ -33,8 +36,17 @@ def get_orders(
     
     - **skip**: Number of orders to skip (default: 0)
     - **limit**: Maximum number of orders to return (default: 100, max: 1000)
+    - **fields**: Sparse fieldset, e.g. `id,status,total_price` (id is always
+      returned); only these columns are loaded from the database
     """
-    return service.get_all_orders(skip=skip, limit=limit)
+    try:
+        selected = parse_fields(fields, ORDER_FIELDS)
+    except InvalidFieldsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return FastJSONResponse(service.get_orders_page(skip=skip, limit=limit, fields=selected))
 
 
 @router.get("/{order_id}", response_model=OrderResponse, summary="Get order by ID")
@@ -53,7 +65,7 @@ def get_order(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Order with id={order_id} not found"
         )
-    return order
+    return FastJSONResponse(order.model_dump())
 
 
 @router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED, summary="Create order")
@@ -66,7 +78,7 @@ async def create_order(
     
     Process:
     1. Validate product exists (call Product Service)
-    2. Check stock availability
+    2. Reserve stock (held until the OrderCreated event is processed)
     3. Calculate total price
     4. Save order to database
     5. Publish OrderCreated event to RabbitMQ
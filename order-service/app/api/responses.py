@@ -0,0 +1,17 @@
+"""
+Fast JSON responses (orjson)
+"""
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson
+    
+    Produces the same JSON as the default response_model path (UTC
+    datetimes end in "Z") at a fraction of the CPU cost.
+    """
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
\ No newline at end of file
@@ -1,21 +1,28 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 
 from app.config import settings
+from app.pools import pool_sizes, instrument_engine, check_connection_budget, InstrumentedQueuePool
+
+# Pool and threadpool sizes (DB_POOL_SIZE, DB_MAX_OVERFLOW, THREADPOOL_SIZE or autosized)
+POOL_SIZES = pool_sizes()
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=POOL_SIZES.pool_size,
+    max_overflow=POOL_SIZES.max_overflow,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
     echo=False
 )
+instrument_engine(engine, "primary")
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(
@@ -39,8 +46,25 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def init_db():
+def ping_database() -> None:
+    """Run SELECT 1 on a pooled connection (health probe)"""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def warm_up_database():
     """
-    Initialize database - create all tables
+    Check the schema version and open DATABASE_WARMUP_CONNECTIONS pooled connections
+    
+    Raises:
+        SchemaVersionError: If the database is not migrated to this build's revision
     """
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    from app.schema import check_schema_version
+    
+    connections = [engine.connect() for _ in range(max(1, settings.DATABASE_WARMUP_CONNECTIONS))]
+    try:
+        check_schema_version(connections[0])
+        check_connection_budget(connections[0])
+    finally:
+        for connection in connections:
+            connection.close()
\ No newline at end of file
@@ -6,8 +6,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.config import settings
-from app.database import init_db
+from app.database import warm_up_database, ping_database, POOL_SIZES
+from app.readiness import readiness
+from app.pools import configure_threadpool
+from app.background import PeriodicTask
+from app.health_monitor import health_monitor
+from app.services.product_client import ping_product_service, probe_client
+from app.publishers.event_publisher import EventPublisher
 from app.api import orders, health
+from app.services.total_counter import drop_unmaintained_counter
+from app.models.order import Order
 
 # Create FastAPI application
 app = FastAPI(
@@ -34,13 +42,37 @@ app.include_router(orders.router)
 # Prometheus metrics
 Instrumentator().instrument(app).expose(app)
 
+# GET /ready: schema at this build's revision, connection pool warm, broker reachable
+readiness.add("database", warm_up_database)
+readiness.add("broker", EventPublisher().check_connection)
+
+# GET /health snapshot
+health_monitor.add("database", ping_database)
+health_monitor.add("product_service", ping_product_service)
+health_checker = PeriodicTask(
+    "health-checker",
+    health_monitor.refresh,
+    settings.HEALTH_CHECK_INTERVAL_SECONDS
+)
+
 
 @app.on_event("startup")
 def startup_event():
-    """Initialize database on startup"""
+    """Warm up connections (schema is migrated by migrate.py)"""
     print(f"Starting {settings.SERVICE_NAME}...")
-    init_db()
-    print(f"✓ Database initialized")
+    configure_threadpool(POOL_SIZES.threadpool_size)
+    print(
+        f"✓ Pools: {POOL_SIZES.pool_size} + {POOL_SIZES.max_overflow} overflow connections, "
+        f"{POOL_SIZES.threadpool_size} threads{' (autosized)' if settings.DB_POOL_AUTOSIZE else ''}"
+    )
+    if readiness.run():
+        print(f"✓ Database and RabbitMQ ready")
+        drop_unmaintained_counter(Order)
+    else:
+        # Not fatal: GET /ready keeps retrying and reports 503 meanwhile
+        print(f"✗ Not ready yet: {readiness.status()}")
+    health_monitor.refresh()
+    health_checker.start()
     print(f"✓ Product Service URL: {settings.PRODUCT_SERVICE_URL}")
     print(f"✓ RabbitMQ URL: {settings.RABBITMQ_URL}")
     print(f"✓ {settings.SERVICE_NAME} is running on port {settings.SERVICE_PORT}")
@@ -49,4 +81,6 @@ def startup_event():
 @app.on_event("shutdown")
 def shutdown_event():
     """Cleanup on shutdown"""
-    print(f"Shutting down {settings.SERVICE_NAME}...")
\ No newline at end of file
+    print(f"Shutting down {settings.SERVICE_NAME}...")
+    health_checker.stop()
+    probe_client.close()
\ No newline at end of file
@@ -2,5 +2,6 @@
 Models package
 """
 from app.models.order import Order
+from app.models.row_count import RowCount
 
-__all__ = ["Order"]
\ No newline at end of file
+__all__ = ["Order", "RowCount"]
\ No newline at end of file
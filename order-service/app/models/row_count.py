@@ -0,0 +1,17 @@
+"""
+SQLAlchemy RowCount model
+"""
+from sqlalchemy import Column, String, BigInteger
+from app.database import Base
+
+
+class RowCount(Base):
+    """Row counters maintained by create/delete paths (COUNT_STRATEGY=counter)"""
+    
+    __tablename__ = "row_counts"
+    
+    table_name = Column(String(100), primary_key=True)
+    row_count = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<RowCount(table_name='{self.table_name}', row_count={self.row_count})>"
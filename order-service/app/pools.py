@@ -0,0 +1,160 @@
+"""
+Connection pool and threadpool sizing and saturation metrics
+"""
+import time
+from typing import NamedTuple
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from app.config import settings
+
+# Defaults when neither set explicitly nor autosized (SQLAlchemy pool: 10 + 20, AnyIO threadpool: 40)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+DEFAULT_THREADPOOL_SIZE = 40
+
+# Prometheus metrics (exposed on /metrics)
+POOL_SIZE = Gauge("db_pool_size", "Connections kept open by the pool", ["pool"])
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out", ["pool"])
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size", ["pool"])
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool (queueing and new connections)",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up after pool_timeout", ["pool"])
+THREADPOOL_SIZE = Gauge("threadpool_size", "Worker threads available to sync endpoints and dependencies")
+THREADPOOL_BUSY = Gauge("threadpool_busy", "Worker threads running sync endpoints and dependencies")
+THREADPOOL_QUEUE_DEPTH = Gauge("threadpool_queue_depth", "Sync calls waiting for a free worker thread")
+
+
+class PoolSizes(NamedTuple):
+    """Per-process sizes of a database engine's pool and the request threadpool"""
+    pool_size: int
+    max_overflow: int
+    threadpool_size: int
+
+
+def connection_budget() -> int:
+    """
+    Connections one API process may open to a database server
+    
+    DB_MAX_CONNECTIONS minus DB_RESERVED_CONNECTIONS (consumers, migrations,
+    psql), shared by WEB_CONCURRENCY worker processes in each of API_REPLICAS
+    containers.
+    """
+    processes = max(1, settings.WEB_CONCURRENCY) * max(1, settings.API_REPLICAS)
+    return max(1, (settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS) // processes)
+
+
+def pool_sizes(engines: int = 1) -> PoolSizes:
+    """
+    Pool and threadpool sizes from settings
+    
+    With DB_POOL_AUTOSIZE, sizes left unset are derived from the connection
+    budget: it is split evenly across the process's engines that open
+    connections to the same server, half of each share kept open and half
+    as overflow, so all processes at peak stay within max_connections. The
+    threadpool gets one thread per connection of a sync engine: more threads
+    would only queue on the pool. Explicit settings always win.
+    
+    Args:
+        engines: Engines of one process sharing the server
+    
+    Returns:
+        PoolSizes for each of those engines
+    """
+    if settings.DB_POOL_AUTOSIZE:
+        share = max(1, connection_budget() // max(1, engines))
+        pool_size = max(1, share // 2)
+        max_overflow = share - pool_size
+    else:
+        pool_size, max_overflow = DEFAULT_POOL_SIZE, DEFAULT_MAX_OVERFLOW
+    
+    if settings.DB_POOL_SIZE is not None:
+        pool_size = settings.DB_POOL_SIZE
+    if settings.DB_MAX_OVERFLOW is not None:
+        max_overflow = settings.DB_MAX_OVERFLOW
+    
+    if settings.THREADPOOL_SIZE is not None:
+        threadpool_size = settings.THREADPOOL_SIZE
+    elif settings.DB_POOL_AUTOSIZE:
+        threadpool_size = pool_size + max_overflow
+    else:
+        threadpool_size = DEFAULT_THREADPOOL_SIZE
+    
+    return PoolSizes(pool_size, max_overflow, threadpool_size)
+
+
+class _CheckoutTimingMixin:
+    """Records how long _do_get (wait for a free connection or open a new one) takes"""
+    
+    label = "primary"
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.labels(pool=self.label).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(pool=self.label).observe(time.perf_counter() - start)
+    
+    def recreate(self):
+        # engine.dispose() replaces the pool; keep its metrics label
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool exporting checkout wait time (create_engine poolclass)"""
+
+
+
+def instrument_engine(engine, label: str) -> None:
+    """
+    Export pool gauges of an engine created with an instrumented poolclass
+    
+    Gauges read engine.pool on every scrape, so they follow the pool
+    replaced by engine.dispose().
+    
+    Args:
+        engine: Engine
+        label: Value of the "pool" metric label
+    """
+    engine.pool.label = label
+    POOL_SIZE.labels(pool=label).set_function(lambda: engine.pool.size())
+    POOL_CHECKED_OUT.labels(pool=label).set_function(lambda: engine.pool.checkedout())
+    POOL_OVERFLOW.labels(pool=label).set_function(lambda: max(0, engine.pool.overflow()))
+
+
+def configure_threadpool(size: int) -> None:
+    """
+    Resize the AnyIO threadpool running sync endpoints and dependencies and export its load
+    
+    Must run in the event loop (startup event): the default limiter is per
+    event loop.
+    """
+    from anyio.to_thread import current_default_thread_limiter
+    
+    limiter = current_default_thread_limiter()
+    limiter.total_tokens = size
+    THREADPOOL_SIZE.set_function(lambda: limiter.total_tokens)
+    THREADPOOL_BUSY.set_function(lambda: limiter.statistics().borrowed_tokens)
+    THREADPOOL_QUEUE_DEPTH.set_function(lambda: limiter.statistics().tasks_waiting)
+
+
+def check_connection_budget(connection) -> None:
+    """Warn if DB_MAX_CONNECTIONS exceeds the server's max_connections (autosizing)"""
+    if not settings.DB_POOL_AUTOSIZE:
+        return
+    server_max = int(connection.exec_driver_sql("SHOW max_connections").scalar())
+    if server_max < settings.DB_MAX_CONNECTIONS:
+        print(
+            f"Warning: DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS} exceeds the server's "
+            f"max_connections={server_max}; pools may be refused connections at peak"
+        )
\ No newline at end of file
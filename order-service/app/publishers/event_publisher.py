@@ -18,6 +18,26 @@ class EventPublisher:
         self.exchange = settings.RABBITMQ_EXCHANGE
         self.routing_key = settings.RABBITMQ_ROUTING_KEY
     
+    def check_connection(self) -> None:
+        """
+        Connect to RabbitMQ and declare the exchange (readiness check)
+        
+        Raises:
+            pika.exceptions.AMQPError: If the broker is unreachable
+        """
+        connection = pika.BlockingConnection(
+            pika.URLParameters(self.rabbitmq_url)
+        )
+        try:
+            channel = connection.channel()
+            channel.exchange_declare(
+                exchange=self.exchange,
+                exchange_type='topic',
+                durable=True
+            )
+        finally:
+            connection.close()
+    
     def publish_order_created(self, order_data: Dict) -> bool:
         """
         Publish OrderCreated event to RabbitMQ
@@ -63,7 +83,9 @@ class EventPublisher:
                 properties=pika.BasicProperties(
                     delivery_mode=2,  # Persistent message
                     content_type='application/json',
-                    correlation_id=event["event_id"]
+                    correlation_id=event["event_id"],
+                    # Partition key for product consumers (consistent-hash exchange)
+                    headers={"product_id": str(order_data.get("product_id"))}
                 ),
                 mandatory=True
             )
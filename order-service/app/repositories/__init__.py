@@ -2,5 +2,6 @@
 Repositories package
 """
 from app.repositories.order_repository import OrderRepository
+from app.repositories.row_count_repository import RowCountRepository
 
-__all__ = ["OrderRepository"]
\ No newline at end of file
+__all__ = ["OrderRepository", "RowCountRepository"]
\ No newline at end of file
@@ -1,12 +1,13 @@
 """
 Order Repository - Data Access Layer
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import List, Optional, Sequence
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import desc
 
 from app.models.order import Order
 from app.schemas.order import OrderCreate
+from app.repositories.row_count_repository import RowCountRepository
 
 
 class OrderRepository:
@@ -14,10 +15,14 @@ class OrderRepository:
     
     def __init__(self, db: Session):
         self.db = db
+        self.row_counts = RowCountRepository(db)
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Order]:
-        """Get all orders with pagination"""
-        return self.db.query(Order).order_by(
+    def get_all(self, skip: int = 0, limit: int = 100, columns: Optional[Sequence[str]] = None) -> List[Order]:
+        """Get all orders with pagination, optionally loading only some columns"""
+        query = self.db.query(Order)
+        if columns is not None:
+            query = query.options(load_only(*(getattr(Order, name) for name in columns)))
+        return query.order_by(
             desc(Order.created_at)
         ).offset(skip).limit(limit).all()
     
@@ -49,6 +54,7 @@ class OrderRepository:
         """
         order = Order(**order_data)
         self.db.add(order)
+        self.row_counts.increment(Order.__tablename__, 1)
         self.db.commit()
         self.db.refresh(order)
         return order
@@ -45,7 +45,8 @@ class OrderResponse(BaseModel):
 class OrderListResponse(BaseModel):
     """Schema for list of orders response"""
     orders: list[OrderResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Total count (None when COUNT_STRATEGY=none)")
+    has_more: bool = Field(False, description="Whether more orders follow this page")
 
 
 class OrderCreatedEvent(BaseModel):
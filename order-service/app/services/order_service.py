@@ -1,13 +1,31 @@
 """
 Order Service - Business Logic Layer
 """
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from sqlalchemy.orm import Session
 
 from app.repositories.order_repository import OrderRepository
-from app.services.product_client import ProductServiceClient, ProductNotFoundError, ProductServiceUnavailableError
+from app.services.product_client import (
+    ProductServiceClient,
+    ProductNotFoundError,
+    ProductServiceUnavailableError,
+    InsufficientStockError
+)
 from app.publishers.event_publisher import EventPublisher
-from app.schemas.order import OrderCreate, OrderResponse, OrderListResponse
+from app.services.total_counter import TotalCounter
+from app.schemas.order import OrderCreate, OrderResponse
+from app.models.order import Order
+
+# OrderResponse fields, copied straight from database rows on the fast JSON path
+ORDER_FIELDS = tuple(OrderResponse.model_fields)
+
+
+def order_to_dict(order: Order, fields: Sequence[str] = ORDER_FIELDS) -> dict:
+    """OrderResponse-shaped dict (optionally only some fields) of a trusted database row (not validated)"""
+    # Loaded attributes are read from the instance dict, skipping the ORM
+    # descriptors; expired ones are loaded through getattr
+    state = order.__dict__
+    return {field: state[field] if field in state else getattr(order, field) for field in fields}
 
 
 class OrderService:
@@ -15,18 +33,27 @@ class OrderService:
     
     def __init__(self, db: Session):
         self.repository = OrderRepository(db)
+        self.total_counter = TotalCounter(db, Order)
         self.product_client = ProductServiceClient()
         self.event_publisher = EventPublisher()
     
-    def get_all_orders(self, skip: int = 0, limit: int = 100) -> OrderListResponse:
-        """Get all orders with pagination"""
-        orders = self.repository.get_all(skip=skip, limit=limit)
-        total = self.repository.count()
-        
-        return OrderListResponse(
-            orders=[OrderResponse.model_validate(o) for o in orders],
-            total=total
-        )
+    def get_orders_page(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> dict:
+        """
+        Get orders with pagination, as a plain dict for FastJSONResponse
+        
+        Rows are copied into dicts instead of being validated into models,
+        which dominates the cost of large pages.
+        
+        Args:
+            fields: Fields to return (None: all), see parse_fields; only
+                these columns are selected
+        """
+        orders = self.repository.get_all(skip=skip, limit=limit + 1, columns=fields)
+        return {
+            "orders": [order_to_dict(o, fields or ORDER_FIELDS) for o in orders[:limit]],
+            "total": self.total_counter.get_total(self.repository.count),
+            "has_more": len(orders) > limit
+        }
     
     def get_order_by_id(self, order_id: int) -> Optional[OrderResponse]:
         """Get order by ID"""
@@ -47,7 +74,7 @@ class OrderService:
         Steps:
         1. Validate input
         2. Call Product Service to get product info (sync)
-        3. Check stock availability
+        3. Reserve stock (hold with TTL, confirmed by the OrderCreated consumer)
         4. Calculate total price
         5. Save order to database
         6. Publish OrderCreated event to RabbitMQ
@@ -61,8 +88,9 @@ class OrderService:
         
         Raises:
             ProductNotFoundError: If product not found
-            ProductServiceUnavailableError: If Product Service unavailable
-            ValueError: If insufficient stock
+            ValueError: If product not found or insufficient stock
+            RuntimeError: If Product Service is unavailable or the event
+                could not be published (the order is cancelled then)
         """
         # Step 1: Get product info from Product Service (sync call)
         try:
@@ -72,19 +100,22 @@ class OrderService:
         except ProductServiceUnavailableError as e:
             raise RuntimeError(f"Product Service unavailable: {e}")
         
-        # Step 2: Check stock availability
+        # Step 2: Reserve stock, so concurrent orders cannot oversell before
+        # the OrderCreated event is processed
         try:
-            has_stock = await self.product_client.check_stock(
+            reservation = await self.product_client.reserve_stock(
                 order_data.product_id,
                 order_data.quantity
             )
-            if not has_stock:
-                raise ValueError(
-                    f"Insufficient stock. Product ID: {order_data.product_id}, "
-                    f"Requested: {order_data.quantity}, Available: {product.get('stock', 0)}"
-                )
+        except InsufficientStockError:
+            raise ValueError(
+                f"Insufficient stock. Product ID: {order_data.product_id}, "
+                f"Requested: {order_data.quantity}, Available: {product.get('stock', 0)}"
+            )
+        except ProductNotFoundError as e:
+            raise ValueError(f"Product not found: {e}")
         except ProductServiceUnavailableError as e:
-            raise RuntimeError(f"Cannot verify stock: {e}")
+            raise RuntimeError(f"Cannot reserve stock: {e}")
         
         # Step 3: Calculate total price
         unit_price = product['price']
@@ -101,7 +132,11 @@ class OrderService:
             'customer_email': order_data.customer_email
         }
         
-        order = self.repository.create(order_dict)
+        try:
+            order = self.repository.create(order_dict)
+        except Exception:
+            await self.product_client.release_reservation(reservation['id'])
+            raise
         
         # Step 5: Publish OrderCreated event
         event_data = {
@@ -112,16 +147,21 @@ class OrderService:
             'unit_price': order.unit_price,
             'total_price': order.total_price,
             'customer_email': order.customer_email,
-            'status': order.status
+            'status': order.status,
+            'reservation_id': reservation['id']
         }
         
-        # Try to publish event (non-blocking)
+        # Without the event the hold would never be confirmed and quietly
+        # expire under a pending order: cancel the order and release the hold
         try:
-            self.event_publisher.publish_order_created(event_data)
+            published = self.event_publisher.publish_order_created(event_data)
         except Exception as e:
-            # Log error but don't fail the order creation
-            print(f"Warning: Failed to publish OrderCreated event: {e}")
-            # In production, save to outbox table for retry
+            print(f"✗ Error publishing OrderCreated event: {e}")
+            published = False
+        if not published:
+            self.repository.update_status(order.id, 'cancelled')
+            await self.product_client.release_reservation(reservation['id'])
+            raise RuntimeError(f"Order {order.id} cancelled: OrderCreated event could not be published")
         
         return OrderResponse.model_validate(order)
     
@@ -3,7 +3,7 @@ HTTP Client for Product Service with retry logic
 """
 import httpx
 from typing import Optional, Dict
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception, retry_if_exception_type
 
 from app.config import settings
 
@@ -28,6 +28,33 @@ class InsufficientStockError(ProductServiceError):
     pass
 
 
+# Shared client for health probes (keeps its connection to Product Service alive)
+probe_client = httpx.Client(base_url=settings.PRODUCT_SERVICE_URL, timeout=2.0)
+
+
+def ping_product_service() -> None:
+    """
+    Probe Product Service readiness (health probe)
+    
+    Uses /ready, which does no I/O once Product Service is ready, so probes
+    do not cascade into its database.
+    
+    Raises:
+        ProductServiceUnavailableError: If it is unreachable or not ready
+    """
+    try:
+        response = probe_client.get("/ready")
+    except httpx.HTTPError as e:
+        raise ProductServiceUnavailableError(f"Product Service unavailable: {e}")
+    if response.status_code != 200:
+        raise ProductServiceUnavailableError(f"status {response.status_code}")
+
+
+def _not_sent(error: BaseException) -> bool:
+    """Whether a request failed before reaching Product Service (safe to repeat)"""
+    return isinstance(error, ProductServiceUnavailableError) and isinstance(error.__cause__, httpx.ConnectError)
+
+
 class ProductServiceClient:
     """Client for communicating with Product Service"""
     
@@ -108,4 +135,70 @@ class ProductServiceClient:
         
         except (httpx.TimeoutException, httpx.ConnectError) as e:
             print(f"Error calling Product Service: {e}")
-            raise ProductServiceUnavailableError(f"Product Service unavailable: {e}")
\ No newline at end of file
+            raise ProductServiceUnavailableError(f"Product Service unavailable: {e}")
+    
+    @retry(
+        stop=stop_after_attempt(settings.MAX_RETRIES),
+        wait=wait_exponential(multiplier=settings.RETRY_DELAY, min=1, max=10),
+        retry=retry_if_exception(_not_sent),
+        reraise=True
+    )
+    async def reserve_stock(self, product_id: int, quantity: int) -> Dict:
+        """
+        Hold stock for an order (released automatically if never confirmed)
+        
+        Retried only when the connection could not be opened: repeating the
+        POST after a timeout could hold stock twice.
+        
+        Args:
+            product_id: Product ID
+            quantity: Quantity to hold
+        
+        Returns:
+            Reservation data (id, expires_at, ...)
+        
+        Raises:
+            ProductNotFoundError: If product not found
+            InsufficientStockError: If there is not enough stock
+            ProductServiceUnavailableError: If service is unavailable
+        """
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.post(
+                    f"{self.base_url}/reservations",
+                    json={
+                        "items": [{"product_id": product_id, "quantity": quantity}],
+                        "ttl_seconds": settings.RESERVATION_TTL_SECONDS
+                    }
+                )
+                
+                if response.status_code == 201:
+                    return response.json()[0]
+                elif response.status_code == 404:
+                    raise ProductNotFoundError(f"Product {product_id} not found")
+                elif response.status_code == 409:
+                    raise InsufficientStockError(response.json().get("detail", "Insufficient stock"))
+                else:
+                    raise ProductServiceError(f"Unexpected status code: {response.status_code}")
+        
+        except (httpx.TimeoutException, httpx.ConnectError) as e:
+            print(f"Error calling Product Service: {e}")
+            raise ProductServiceUnavailableError(f"Product Service unavailable: {e}") from e
+    
+    async def release_reservation(self, reservation_id: int) -> bool:
+        """
+        Release a stock hold (best effort - it expires anyway)
+        
+        Args:
+            reservation_id: Reservation ID
+        
+        Returns:
+            True if released, False otherwise
+        """
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.delete(f"{self.base_url}/reservations/{reservation_id}")
+                return response.status_code == 200
+        except httpx.HTTPError as e:
+            print(f"Error releasing reservation {reservation_id}: {e}")
+            return False
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Script to apply database migrations for Order Service
+
+Run once per deploy, before the API processes start (they only check
+the schema revision). Databases created before migrations existed
+(tables made by the API at startup) are stamped at the baseline revision
+first, provided they have every baseline table and column; later
+revisions then add whatever the database is missing.
+
+Usage:
+    python migrate.py            # upgrade to the latest revision
+    python migrate.py 0001       # upgrade to a specific revision
+"""
+import argparse
+import os
+import sys
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, pool, text
+
+from app.config import settings
+from app.schema import MIGRATIONS_DIR, BASELINE_REVISION, current_revision, missing_baseline_columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("revision", nargs="?", default="head", help="Target revision (default: head)")
+    args = parser.parse_args()
+    
+    config = Config(os.path.join(MIGRATIONS_DIR, "alembic.ini"))
+    
+    engine = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    try:
+        with engine.connect() as connection:
+            revision = current_revision(connection)
+            legacy = revision is None and connection.execute(text("SELECT to_regclass('orders')")).scalar() is not None
+            missing = missing_baseline_columns(connection) if legacy else []
+    except Exception as e:
+        print(f"✗ Cannot connect to database: {e}")
+        sys.exit(1)
+    finally:
+        engine.dispose()
+    
+    if missing:
+        print(f"✗ Database was created without migrations but does not match baseline revision {BASELINE_REVISION}, missing: {', '.join(missing)}")
+        sys.exit(1)
+    if legacy:
+        print(f"Database was created without migrations, stamping baseline revision {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    
+    command.upgrade(config, args.revision)
+    print(f"✓ Database migrated to {args.revision}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""baseline schema
+
+Schema of the orders table as the API created it at startup (init_db,
+create_all) before any later feature. Databases created that way are
+stamped at this revision by migrate.py; later revisions skip objects that
+exist, because init_db also created them on databases set up after the
+feature was added.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 21:30:30.091850
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('orders',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('product_name', sa.String(length=255), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Float(), nullable=False),
+    sa.Column('total_price', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('customer_email', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint("status IN ('pending', 'processing', 'completed', 'cancelled')", name='check_status_valid'),
+    sa.CheckConstraint('quantity > 0', name='check_quantity_positive'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_orders_customer_email'), 'orders', ['customer_email'], unique=False)
+    op.create_index(op.f('ix_orders_id'), 'orders', ['id'], unique=False)
+    op.create_index(op.f('ix_orders_product_id'), 'orders', ['product_id'], unique=False)
+    op.create_index(op.f('ix_orders_status'), 'orders', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_orders_status'), table_name='orders')
+    op.drop_index(op.f('ix_orders_product_id'), table_name='orders')
+    op.drop_index(op.f('ix_orders_id'), table_name='orders')
+    op.drop_index(op.f('ix_orders_customer_email'), table_name='orders')
+    op.drop_table('orders')
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""order row count
+
+Maintained row counter (COUNT_STRATEGY=counter). The orders counter is
+seeded with the exact count, so databases that already hold orders start
+correct; an existing table or counter is kept.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:23:09.641257
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('row_counts'):
+        op.create_table('row_counts',
+        sa.Column('table_name', sa.String(length=100), nullable=False),
+        sa.Column('row_count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('table_name')
+        )
+    op.execute("""
+    INSERT INTO row_counts (table_name, row_count)
+    SELECT 'orders', count(*) FROM orders
+    ON CONFLICT (table_name) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('row_counts')
\ No newline at end of file
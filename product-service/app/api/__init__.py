@@ -1,6 +1,6 @@
 """
 API package
 """
-from app.api import products, health
+from app.api import products, reservations, health
 
-__all__ = ["products", "health"]
\ No newline at end of file
+__all__ = ["products", "reservations", "health"]
\ No newline at end of file
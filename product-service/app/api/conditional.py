@@ -0,0 +1,40 @@
+"""
+Conditional GET helpers (ETag / If-None-Match)
+"""
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, status
+
+from app.config import settings
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the values that identify a representation"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Apply ETag and Cache-Control headers and evaluate If-None-Match
+    
+    Args:
+        request: Incoming request
+        response: Response that will carry the full body
+        etag: Current ETag of the representation
+    
+    Returns:
+        Empty 304 response if the client already has this representation,
+        otherwise None (headers are set on response)
+    """
+    headers = {"ETag": etag, "Cache-Control": settings.HTTP_CACHE_CONTROL}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match uses weak comparison (RFC 9110)
+        if "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return None
@@ -1,42 +1,75 @@
 """
 Health check endpoint
 """
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi import APIRouter, Response, status
 from datetime import datetime
 
-from app.database import get_db
+from app.database import replica_router
+from app.readiness import readiness
+from app.health_monitor import health_monitor
 from app.config import settings
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
-def health_check(db: Session = Depends(get_db)):
+async def health_check():
     """
     Health check endpoint
     
     Returns service health status including:
     - Service status
     - Database connectivity
+    - Read replica health and lag (reads fall back to the primary)
     - Timestamp
+    
+    Served from the snapshot refreshed every HEALTH_CHECK_INTERVAL_SECONDS
+    (no I/O per request); checks reports each dependency's status age.
     """
-    # Check database connection
-    try:
-        db.execute(text("SELECT 1"))
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
+    checks = health_monitor.snapshot()
+    healthy = all(check["status"] == "healthy" for check in checks.values())
     
     return {
         "service": settings.SERVICE_NAME,
-        "status": "healthy" if db_status == "healthy" else "unhealthy",
-        "database": db_status,
+        "status": "healthy" if healthy else "unhealthy",
+        "database": checks["database"]["status"],
+        "replicas": replica_router.status(),
+        "checks": checks,
         "timestamp": datetime.utcnow().isoformat()
     }
 
 
+@router.get("/live")
+def liveness():
+    """
+    Liveness probe
+    
+    The process is up and serving requests; no dependencies are checked,
+    so a database outage does not get the container restarted.
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+def readiness_probe(response: Response):
+    """
+    Readiness probe
+    
+    200 once the warm-up checks have passed (database migrated to this
+    build's revision, pooled connections open), 503 until then. Failed
+    checks are retried on every call; passed checks are not repeated, so
+    a ready process answers without any I/O.
+    """
+    ready = readiness.run()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "service": settings.SERVICE_NAME,
+        "status": "ready" if ready else "not ready",
+        "checks": readiness.status()
+    }
+
+
 @router.get("/")
 def root():
     """Root endpoint"""
@@ -1,61 +1,237 @@
 """
 Product API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Literal, Tuple
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
-from app.services.product_service import ProductService
+from app.config import settings
+from app.database import get_db, get_read_db, get_async_read_db
+from app.api.conditional import make_etag, conditional_response
+from app.api.responses import fast_json_response
+from app.services.product_service import ProductService, PRODUCT_FIELDS
+from app.services.async_product_service import AsyncProductService
+from app.services.pagination import InvalidCursorError, decode_cursor
+from app.services.fieldsets import InvalidFieldsError, parse_fields
+from app.services.product_import_service import ProductImporter, iter_body_lines
+from app.services.category_stats_service import CategoryStatsService
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
     StockUpdate,
+    StockBucketsUpdate,
     ProductResponse,
     ProductListResponse,
-    StockCheckResponse
+    StockCheckResponse,
+    StockCheckItem,
+    ProductLookupRequest,
+    ProductLookupResponse,
+    ProductImportResponse,
+    CategoryStatsResponse
 )
 
 router = APIRouter(prefix="/products", tags=["products"])
 
 
+def product_etag(product: ProductResponse) -> str:
+    """ETag of a single product (stock included for striped inventory)"""
+    return make_etag("product", product.id, product.updated_at.isoformat(), product.stock)
+
+
+def product_list_etag(catalog_version: Tuple[int, Optional[int]], *query) -> str:
+    """ETag of a list page: catalog versions plus query parameters (known before the page is loaded)"""
+    return make_etag("products", *catalog_version, *query)
+
+
 def get_product_service(db: Session = Depends(get_db)) -> ProductService:
     """Dependency to get ProductService instance"""
     return ProductService(db)
 
 
+def get_read_product_service(db: Session = Depends(get_read_db)) -> ProductService:
+    """Dependency to get ProductService instance for reads (replica when available)"""
+    return ProductService(db)
+
+
+def get_async_product_service(db: AsyncSession = Depends(get_async_read_db)) -> AsyncProductService:
+    """Dependency to get AsyncProductService instance (reads only, replica when available)"""
+    return AsyncProductService(db)
+
+
 @router.get("", response_model=ProductListResponse, summary="Get all products")
 def get_products(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of products to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of products to return"),
-    service: ProductService = Depends(get_product_service)
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    category: Optional[str] = Query(None, max_length=100, description="Filter by category"),
+    fields: Optional[str] = Query(None, max_length=500, description="Comma-separated fields to return (default: all)"),
+    service: ProductService = Depends(get_read_product_service)
 ):
     """
     Retrieve all products with pagination
     
-    - **skip**: Number of products to skip (default: 0)
+    - **skip**: Number of products to skip (default: 0, ignored when cursor is set)
     - **limit**: Maximum number of products to return (default: 100, max: 1000)
+    - **cursor**: Opaque cursor for keyset pagination (recommended for deep pages)
+    - **category**: Filter by category
+    - **fields**: Sparse fieldset, e.g. `id,name,price` (id is always returned);
+      only these columns are loaded from the database
+    
+    Supports conditional requests: send the returned ETag in If-None-Match
+    to get an empty 304 while the catalog has not changed. The ETag comes
+    from the catalog version, so a 304 skips the page and count queries.
+    Stock changes only affect the ETag of pages with stock or updated_at.
     """
-    return service.get_all_products(skip=skip, limit=limit)
+    try:
+        selected = parse_fields(fields, PRODUCT_FIELDS)
+        if cursor is not None:
+            decode_cursor(cursor, category)  # A malformed cursor gets 400, never 304
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    etag = product_list_etag(service.get_catalog_version(selected), skip, limit, cursor, category, selected)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    page = service.get_products_page(
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        category=category,
+        fields=selected
+    )
+    return fast_json_response(page, response)
 
 
-@router.get("/{product_id}", response_model=ProductResponse, summary="Get product by ID")
-def get_product(
-    product_id: int,
-    service: ProductService = Depends(get_product_service)
+@router.get("/search", response_model=ProductListResponse, summary="Search products")
+def search_products(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    category: Optional[str] = Query(None, max_length=100, description="Filter by category"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
+    skip: int = Query(0, ge=0, description="Number of results to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results to return"),
+    service: ProductService = Depends(get_read_product_service)
 ):
     """
-    Retrieve a specific product by ID
+    Full-text search over product name and description, ranked by relevance
     
-    - **product_id**: Product ID
+    - **q**: Search terms (supports "quoted phrases", OR and -exclusions)
+    - **category**: Filter by category
+    - **min_price** / **max_price**: Price range filter
+    - **skip** / **limit**: Pagination (default limit: 20, max: 100)
     """
-    product = service.get_product_by_id(product_id)
-    if not product:
+    return service.search_products(
+        q,
+        category=category,
+        min_price=min_price,
+        max_price=max_price,
+        skip=skip,
+        limit=limit
+    )
+
+
+@router.get("/stats", response_model=CategoryStatsResponse, summary="Get per-category statistics")
+def get_category_stats(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Product count, total stock, out-of-stock count and price range per category
+    
+    Served from a materialized view refreshed every
+    CATEGORY_STATS_REFRESH_INTERVAL_SECONDS (see refreshed_at), so the cost
+    depends on the number of categories, not products. Supports
+    If-None-Match like the other product GETs.
+    """
+    stats = CategoryStatsService(db).get_stats()
+    not_modified = conditional_response(request, response, make_etag("category-stats", stats.refreshed_at))
+    if not_modified:
+        return not_modified
+    return stats
+
+
+if settings.DATABASE_MODE == "async":
+    @router.get("/{product_id}", response_model=ProductResponse, summary="Get product by ID")
+    async def get_product(
+        product_id: int,
+        request: Request,
+        response: Response,
+        service: AsyncProductService = Depends(get_async_product_service)
+    ):
+        """
+        Retrieve a specific product by ID
+        
+        - **product_id**: Product ID
+        
+        Supports conditional requests via ETag / If-None-Match (304).
+        """
+        product = await service.get_product_by_id(product_id)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product with id={product_id} not found"
+            )
+        
+        not_modified = conditional_response(request, response, product_etag(product))
+        if not_modified:
+            return not_modified
+        return fast_json_response(product.model_dump(), response)
+else:
+    @router.get("/{product_id}", response_model=ProductResponse, summary="Get product by ID")
+    def get_product(
+        product_id: int,
+        request: Request,
+        response: Response,
+        service: ProductService = Depends(get_read_product_service)
+    ):
+        """
+        Retrieve a specific product by ID
+        
+        - **product_id**: Product ID
+        
+        Supports conditional requests via ETag / If-None-Match (304).
+        """
+        product = service.get_product_by_id(product_id)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product with id={product_id} not found"
+            )
+        
+        not_modified = conditional_response(request, response, product_etag(product))
+        if not_modified:
+            return not_modified
+        return fast_json_response(product.model_dump(), response)
+
+
+@router.post("/lookup", response_model=ProductLookupResponse, summary="Get several products by ID")
+def lookup_products(
+    lookup: ProductLookupRequest,
+    service: ProductService = Depends(get_read_product_service)
+):
+    """
+    Retrieve several products in one request
+    
+    - **ids**: Product IDs (max MAX_BATCH_SIZE)
+    
+    IDs that do not exist are returned in **missing_ids**.
+    """
+    if len(lookup.ids) > settings.MAX_BATCH_SIZE:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product with id={product_id} not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many ids: {len(lookup.ids)} (max {settings.MAX_BATCH_SIZE})"
         )
-    return product
+    return service.get_products_by_ids(lookup.ids)
 
 
 @router.post("", response_model=ProductResponse, status_code=status.HTTP_201_CREATED, summary="Create product")
@@ -72,8 +248,38 @@ def create_product(
     - **stock**: Stock quantity (required, must be non-negative)
     - **category**: Product category (optional)
     - **image_url**: Product image URL (optional)
+    - **sku**: Stock keeping unit, unique (optional)
+    """
+    try:
+        return service.create_product(product_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+
+@router.post("/import", response_model=ProductImportResponse, summary="Bulk import products")
+async def import_products(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Input format"),
+    db: Session = Depends(get_db)
+):
     """
-    return service.create_product(product_data)
+    Bulk insert/update products by sku from a streamed request body
+    
+    - **format=ndjson**: one JSON product object per line
+    - **format=csv**: header line with field names, then one product per record
+      (quoted fields may span lines)
+    
+    Every row needs a **sku**; existing products with the same sku are updated.
+    Rows are validated and upserted in chunks of IMPORT_CHUNK_SIZE while the
+    body is still streaming, so the file is never held in memory.
+    
+    Example: `curl -X POST --data-binary @products.ndjson localhost:8001/products/import`
+    """
+    importer = ProductImporter(db, format)
+    return await run_in_threadpool(importer.run, iter_body_lines(request.stream()))
 
 
 @router.put("/{product_id}", response_model=ProductResponse, summary="Update product")
@@ -89,7 +295,13 @@ def update_product(
     
     - **product_id**: Product ID
     """
-    product = service.update_product(product_id, product_data)
+    try:
+        product = service.update_product(product_id, product_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -146,16 +358,80 @@ def update_stock(
         )
 
 
-@router.get("/{product_id}/check", response_model=StockCheckResponse, summary="Check stock availability")
-def check_stock(
+@router.put("/{product_id}/stock/buckets", response_model=ProductResponse, summary="Configure striped stock")
+def set_stock_buckets(
     product_id: int,
-    quantity: int = Query(1, ge=1, description="Required quantity"),
+    buckets_data: StockBucketsUpdate,
     service: ProductService = Depends(get_product_service)
 ):
     """
-    Check if product has sufficient stock
+    Split product stock across several bucket rows (for hot products)
     
     - **product_id**: Product ID
-    - **quantity**: Required quantity (default: 1)
+    - **buckets**: Number of buckets (max STOCK_MAX_BUCKETS, 0 disables striping)
+    
+    Concurrent stock decrements then lock different buckets instead of the
+    product row. Current stock is preserved; reads return the bucket sum.
+    """
+    if buckets_data.buckets > settings.STOCK_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many buckets: {buckets_data.buckets} (max {settings.STOCK_MAX_BUCKETS})"
+        )
+    
+    product = service.set_stock_buckets(product_id, buckets_data.buckets)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product with id={product_id} not found"
+        )
+    return product
+
+
+if settings.DATABASE_MODE == "async":
+    @router.get("/{product_id}/check", response_model=StockCheckResponse, summary="Check stock availability")
+    async def check_stock(
+        product_id: int,
+        quantity: int = Query(1, ge=1, description="Required quantity"),
+        service: AsyncProductService = Depends(get_async_product_service)
+    ):
+        """
+        Check if product has sufficient stock
+        
+        - **product_id**: Product ID
+        - **quantity**: Required quantity (default: 1)
+        """
+        return await service.check_stock(product_id, quantity)
+else:
+    @router.get("/{product_id}/check", response_model=StockCheckResponse, summary="Check stock availability")
+    def check_stock(
+        product_id: int,
+        quantity: int = Query(1, ge=1, description="Required quantity"),
+        service: ProductService = Depends(get_read_product_service)
+    ):
+        """
+        Check if product has sufficient stock
+        
+        - **product_id**: Product ID
+        - **quantity**: Required quantity (default: 1)
+        """
+        return service.check_stock(product_id, quantity)
+
+
+@router.post("/check-batch", response_model=List[StockCheckResponse], summary="Check stock for several products")
+def check_stock_batch(
+    items: List[StockCheckItem],
+    service: ProductService = Depends(get_read_product_service)
+):
+    """
+    Check stock availability for several products in one request
+    
+    Body: list of {"product_id": ..., "quantity": ...} (max MAX_BATCH_SIZE items).
+    Returns one result per item, in request order.
     """
-    return service.check_stock(product_id, quantity)
\ No newline at end of file
+    if len(items) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many items: {len(items)} (max {settings.MAX_BATCH_SIZE})"
+        )
+    return service.check_stock_batch(items)
\ No newline at end of file
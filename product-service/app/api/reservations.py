@@ -0,0 +1,138 @@
+"""
+Stock reservation API endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.config import settings
+from app.database import get_db, get_read_db
+from app.services.reservation_service import ReservationService, ProductNotFoundError
+from app.schemas.reservation import (
+    ReservationCreate,
+    ReservationConfirm,
+    ReservationResponse
+)
+
+router = APIRouter(prefix="/reservations", tags=["reservations"])
+
+
+def get_reservation_service(db: Session = Depends(get_db)) -> ReservationService:
+    """Dependency to get ReservationService instance"""
+    return ReservationService(db)
+
+
+def get_read_reservation_service(db: Session = Depends(get_read_db)) -> ReservationService:
+    """Dependency to get ReservationService instance for reads (replica when available)"""
+    return ReservationService(db)
+
+
+@router.post("", response_model=List[ReservationResponse], status_code=status.HTTP_201_CREATED, summary="Reserve stock")
+def create_reservations(
+    reservation_data: ReservationCreate,
+    service: ReservationService = Depends(get_reservation_service)
+):
+    """
+    Hold stock for one or more products until confirmed or expired
+    
+    - **items**: List of {"product_id": ..., "quantity": ...} (max MAX_BATCH_SIZE)
+    - **ttl_seconds**: Hold duration (default RESERVATION_TTL_SECONDS, max RESERVATION_MAX_TTL_SECONDS)
+    
+    All items are held or none. Held stock is no longer reported as available.
+    """
+    if len(reservation_data.items) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many items: {len(reservation_data.items)} (max {settings.MAX_BATCH_SIZE})"
+        )
+    if reservation_data.ttl_seconds and reservation_data.ttl_seconds > settings.RESERVATION_MAX_TTL_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ttl_seconds too large: {reservation_data.ttl_seconds} (max {settings.RESERVATION_MAX_TTL_SECONDS})"
+        )
+    
+    try:
+        return service.reserve(reservation_data.items, reservation_data.ttl_seconds)
+    except ProductNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+
+@router.get("/{reservation_id}", response_model=ReservationResponse, summary="Get reservation by ID")
+def get_reservation(
+    reservation_id: int,
+    service: ReservationService = Depends(get_read_reservation_service)
+):
+    """
+    Retrieve a specific reservation by ID
+    
+    - **reservation_id**: Reservation ID
+    """
+    reservation = service.get_reservation(reservation_id)
+    if not reservation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Reservation with id={reservation_id} not found"
+        )
+    return reservation
+
+
+@router.post("/{reservation_id}/confirm", response_model=ReservationResponse, summary="Confirm reservation")
+def confirm_reservation(
+    reservation_id: int,
+    confirm_data: Optional[ReservationConfirm] = None,
+    service: ReservationService = Depends(get_reservation_service)
+):
+    """
+    Confirm a hold so its stock stays taken
+    
+    Normally done by the OrderCreated consumer; confirming twice is a no-op.
+    
+    - **reservation_id**: Reservation ID
+    - **order_id**: Order the hold was used for (optional)
+    """
+    try:
+        reservation = service.confirm(reservation_id, confirm_data.order_id if confirm_data else None)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    if not reservation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Reservation with id={reservation_id} not found"
+        )
+    return reservation
+
+
+@router.delete("/{reservation_id}", response_model=ReservationResponse, summary="Release reservation")
+def release_reservation(
+    reservation_id: int,
+    service: ReservationService = Depends(get_reservation_service)
+):
+    """
+    Release a hold and return its stock
+    
+    - **reservation_id**: Reservation ID
+    """
+    try:
+        reservation = service.release(reservation_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    if not reservation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Reservation with id={reservation_id} not found"
+        )
+    return reservation
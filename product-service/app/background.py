@@ -0,0 +1,31 @@
+"""
+Background jobs running inside the API process
+"""
+import threading
+from typing import Callable
+
+
+class PeriodicTask(threading.Thread):
+    """
+    Daemon thread calling a function every interval_seconds
+    
+    Errors are logged and the task keeps running. Every API worker runs its
+    own copy, so jobs must be safe to run concurrently.
+    """
+    
+    def __init__(self, name: str, func: Callable[[], None], interval_seconds: float):
+        super().__init__(name=name, daemon=True)
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+    
+    def stop(self):
+        """Signal the task to exit after the current run"""
+        self._stop_event.set()
+    
+    def run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.func()
+            except Exception as e:
+                print(f"✗ Background task {self.name} failed: {e}")
@@ -2,5 +2,7 @@
 Consumers package
 """
 from app.consumers.order_consumer import start_consumer
+from app.consumers.async_order_consumer import start_async_consumer
+from app.consumers.partitions import run_partitioned_consumers
 
-__all__ = ["start_consumer"]
\ No newline at end of file
+__all__ = ["start_consumer", "start_async_consumer", "run_partitioned_consumers"]
\ No newline at end of file
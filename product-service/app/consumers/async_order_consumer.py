@@ -0,0 +1,250 @@
+"""
+Asyncio RabbitMQ Consumer for OrderCreated events (aio-pika)
+
+Used with CONSUMER_MODE=async: up to CONSUMER_CONCURRENCY messages are
+processed at once, each in its own AsyncSession (asyncpg), so throughput
+grows with concurrency until the database is the bottleneck.
+"""
+import asyncio
+import json
+import signal
+import sys
+from typing import Optional
+import aio_pika
+from prometheus_client import Gauge, start_http_server
+
+from app.config import settings
+from app.database import AsyncSessionLocal, async_engine
+from app.services.product_service import ProductService
+from app.services.event_filter import maintain_processed_events
+from app.consumers.partitions import partition_queue_name
+
+# Prometheus metrics (exposed on CONSUMER_METRICS_PORT)
+IN_FLIGHT = Gauge("order_events_in_flight", "OrderCreated events being processed")
+
+
+def _process_event(db, event: dict) -> bool:
+    """Run the event through ProductService (called via AsyncSession.run_sync)"""
+    return ProductService(db).process_order_created_event(event)
+
+
+async def handle_message(message: aio_pika.abc.AbstractIncomingMessage) -> None:
+    """
+    Process one OrderCreated message and acknowledge or reject it
+    
+    The idempotent, single-transaction service logic is shared with the
+    sync consumer; run_sync executes it on the session's asyncpg connection
+    without blocking the event loop.
+    
+    Args:
+        message: Incoming message (JSON body)
+    """
+    try:
+        event = json.loads(message.body)
+    except json.JSONDecodeError as e:
+        print(f"✗ Invalid JSON: {e}")
+        await message.nack(requeue=False)
+        return
+    
+    event_id = event.get("event_id")
+    print(f"Received event: {event.get('event_type')} (ID: {event_id})")
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            success = await db.run_sync(_process_event, event)
+    except Exception as e:
+        print(f"✗ Error processing event: {e}")
+        success = False
+    
+    if success:
+        await message.ack()
+        print(f"✓ Event {event_id} processed successfully")
+    else:
+        # Reject and don't requeue (send to DLQ if configured)
+        await message.nack(requeue=False)
+        print(f"✗ Event {event_id} processing failed")
+
+
+async def _passive_declare(connection, declare):
+    """Run a passive declare on a throwaway channel; None if the entity does not exist"""
+    channel = await connection.channel()
+    try:
+        return await declare(channel)
+    except aio_pika.exceptions.ChannelNotFoundEntity:
+        return None
+    finally:
+        if not channel.is_closed:
+            await channel.close()
+
+
+async def unbind_partitions(connection, channel, exchange) -> None:
+    """
+    Stop routing OrderCreated events to partition queues (see partitions.unbind_partitions)
+    
+    Args:
+        connection: aio-pika connection
+        channel: Channel to unbind on
+        exchange: Declared orders exchange
+    """
+    exists = await _passive_declare(
+        connection,
+        lambda probe: probe.get_exchange(settings.RABBITMQ_PARTITION_EXCHANGE, ensure=True)
+    )
+    if exists is None:
+        return  # Never partitioned
+    
+    partition_exchange = await channel.get_exchange(settings.RABBITMQ_PARTITION_EXCHANGE, ensure=False)
+    await partition_exchange.unbind(exchange, routing_key=settings.RABBITMQ_ROUTING_KEY)
+    print(f"✓ Partition exchange unbound: {settings.RABBITMQ_PARTITION_EXCHANGE}")
+    
+    partition = 0
+    while (queue := await _passive_declare(
+        connection,
+        lambda probe: probe.declare_queue(partition_queue_name(partition), passive=True)
+    )) is not None:
+        depth = queue.declaration_result.message_count
+        if depth:
+            print(f"Warning: {depth} messages left in unbound queue {partition_queue_name(partition)}")
+        partition += 1
+
+
+class AsyncOrderConsumer:
+    """
+    Consumes OrderCreated events with bounded concurrency
+    
+    Prefetch and a semaphore both equal the concurrency, so at most that
+    many messages are unacknowledged and processed at a time. On SIGINT /
+    SIGTERM the consumer is cancelled first, in-flight messages are given
+    CONSUMER_SHUTDOWN_TIMEOUT_SECONDS to finish, and anything still
+    unacknowledged is redelivered by the broker after the connection closes.
+    """
+    
+    def __init__(self, concurrency: int, partition: Optional[int] = None):
+        self.concurrency = concurrency
+        self.partition = partition
+        self.queue_name = settings.RABBITMQ_QUEUE if partition is None else partition_queue_name(partition)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks = set()
+        self._stopping = asyncio.Event()
+    
+    async def on_message(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        """Consumer callback: process the message in its own task"""
+        task = asyncio.create_task(self._handle(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _handle(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        async with self._semaphore:
+            IN_FLIGHT.inc()
+            try:
+                await handle_message(message)
+            except Exception as e:
+                # Ack/nack failed (e.g. channel lost): the broker redelivers it
+                print(f"✗ Error acknowledging message: {e}")
+            finally:
+                IN_FLIGHT.dec()
+    
+    async def _maintenance_loop(self) -> None:
+        """Run processed_events maintenance every PROCESSED_EVENTS_PRUNE_INTERVAL_SECONDS"""
+        while True:
+            await asyncio.sleep(settings.PROCESSED_EVENTS_PRUNE_INTERVAL_SECONDS)
+            try:
+                await asyncio.to_thread(maintain_processed_events)
+            except Exception as e:
+                print(f"✗ processed_events maintenance failed: {e}")
+    
+    def stop(self) -> None:
+        """Request graceful shutdown"""
+        self._stopping.set()
+    
+    async def run(self) -> None:
+        """Consume until stop() is called (or a shutdown signal arrives)"""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+        
+        # Prune expired events and export table metrics before consuming
+        await asyncio.to_thread(maintain_processed_events)
+        
+        # Connect to RabbitMQ
+        print(f"Connecting to RabbitMQ: {settings.RABBITMQ_URL}")
+        connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)
+        maintenance = None
+        try:
+            channel = await connection.channel()
+            await channel.set_qos(prefetch_count=self.concurrency)
+            
+            # Partition queues are bound by the supervisor
+            queue = await channel.declare_queue(self.queue_name, durable=True)
+            print(f"✓ Queue declared: {self.queue_name}")
+            
+            if self.partition is None:
+                exchange = await channel.declare_exchange(
+                    settings.RABBITMQ_EXCHANGE,
+                    aio_pika.ExchangeType.TOPIC,
+                    durable=True
+                )
+                print(f"✓ Exchange declared: {settings.RABBITMQ_EXCHANGE}")
+                
+                await queue.bind(exchange, routing_key=settings.RABBITMQ_ROUTING_KEY)
+                print(f"✓ Queue bound to exchange with routing key: {settings.RABBITMQ_ROUTING_KEY}")
+                
+                # Undo an earlier partitioned run so events are not routed twice
+                await unbind_partitions(connection, channel, exchange)
+            
+            maintenance = asyncio.create_task(self._maintenance_loop())
+            consumer_tag = await queue.consume(self.on_message)
+            
+            print(f"✓ {settings.SERVICE_NAME} Consumer started (async, concurrency {self.concurrency})")
+            print(f"✓ Waiting for OrderCreated events on queue: {self.queue_name}")
+            print("Press CTRL+C to exit")
+            
+            await self._stopping.wait()
+            
+            # Stop deliveries, then let in-flight messages finish
+            print("\nStopping consumer...")
+            await queue.cancel(consumer_tag)
+            if self._tasks:
+                done, pending = await asyncio.wait(
+                    set(self._tasks),
+                    timeout=settings.CONSUMER_SHUTDOWN_TIMEOUT_SECONDS
+                )
+                for task in pending:
+                    task.cancel()
+                print(f"✓ {len(done)} in-flight events finished, {len(pending)} left for redelivery")
+        finally:
+            if maintenance:
+                maintenance.cancel()
+            await connection.close()
+            await async_engine.dispose()
+        
+        print("Consumer stopped")
+
+
+def start_async_consumer(partition: Optional[int] = None):
+    """
+    Start asyncio RabbitMQ consumer
+    
+    Connects to RabbitMQ and consumes OrderCreated events with
+    CONSUMER_CONCURRENCY messages in flight
+    
+    Args:
+        partition: Partition queue to consume (see run_partitioned_consumers);
+            None consumes the shared queue
+    """
+    metrics_port = settings.CONSUMER_METRICS_PORT + (partition or 0)
+    
+    try:
+        # Expose consumer metrics (idempotency checks, in-flight events)
+        start_http_server(metrics_port)
+        print(f"✓ Consumer metrics on port {metrics_port}")
+        
+        asyncio.run(AsyncOrderConsumer(settings.CONSUMER_CONCURRENCY, partition).run())
+        sys.exit(0)
+    except Exception as e:
+        print(f"✗ Error starting consumer: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    start_async_consumer()
\ No newline at end of file
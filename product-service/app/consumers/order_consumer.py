@@ -4,11 +4,26 @@ RabbitMQ Consumer for OrderCreated events
 import pika
 import json
 import sys
-from typing import Callable
+from typing import Callable, Optional
+from prometheus_client import Counter, Histogram, start_http_server
 
 from app.config import settings
 from app.database import SessionLocal
 from app.services.product_service import ProductService
+from app.services.event_filter import maintain_processed_events
+from app.consumers.partitions import partition_queue_name, unbind_partitions
+
+# Prometheus metrics (exposed on CONSUMER_METRICS_PORT)
+BATCHES = Counter(
+    "order_event_batches_total",
+    "OrderCreated batches",
+    ["result"]  # committed | fallback
+)
+BATCH_SIZE = Histogram(
+    "order_event_batch_size",
+    "Messages per OrderCreated batch",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
 
 
 def callback(ch, method, properties, body):
@@ -54,13 +69,111 @@ def callback(ch, method, properties, body):
         db.close()
 
 
-def start_consumer():
+class BatchConsumer:
+    """
+    Collects deliveries and applies them as one batch
+    
+    A batch is flushed when it reaches batch_size messages or max_wait_ms
+    after its first message, whichever comes first. It is applied in one
+    transaction and acknowledged with a single basic_ack(multiple=True).
+    If the batch fails, every message is processed on its own (and acked
+    or rejected individually). Everything runs on the connection thread.
+    """
+    
+    def __init__(self, connection, channel, batch_size: int, max_wait_ms: int):
+        self.connection = connection
+        self.channel = channel
+        self.batch_size = batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+        self._messages = []
+        self._timer = None
+    
+    def on_message(self, ch, method, properties, body):
+        """basic_consume callback: buffer message, flush when the batch is full"""
+        self._messages.append((method, body))
+        if len(self._messages) >= self.batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = self.connection.call_later(self.max_wait_seconds, self._on_timeout)
+    
+    def _on_timeout(self):
+        self._timer = None
+        self.flush()
+    
+    def flush(self):
+        """Apply buffered messages"""
+        if self._timer is not None:
+            self.connection.remove_timeout(self._timer)
+            self._timer = None
+        
+        messages, self._messages = self._messages, []
+        if not messages:
+            return
+        BATCH_SIZE.observe(len(messages))
+        
+        valid = []
+        events = []
+        for method, body in messages:
+            try:
+                events.append(json.loads(body))
+                valid.append((method, body))
+            except json.JSONDecodeError as e:
+                print(f"✗ Invalid JSON: {e}")
+                self.channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        if not valid:
+            return
+        
+        db = SessionLocal()
+        try:
+            applied = ProductService(db).process_order_created_batch(events)
+        except Exception as e:
+            print(f"✗ Batch of {len(valid)} events failed ({e}), processing one by one")
+            BATCHES.labels(result="fallback").inc()
+            for method, body in valid:
+                callback(self.channel, method, None, body)
+            return
+        finally:
+            db.close()
+        
+        # Acknowledge every message of the batch at once
+        self.channel.basic_ack(delivery_tag=max(m.delivery_tag for m, _ in valid), multiple=True)
+        BATCHES.labels(result="committed").inc()
+        print(f"✓ Batch processed: {len(valid)} events ({applied} applied, {len(valid) - applied} duplicates)")
+
+
+def schedule_maintenance(connection):
+    """Run processed_events maintenance every PROCESSED_EVENTS_PRUNE_INTERVAL_SECONDS"""
+    def run():
+        try:
+            maintain_processed_events()
+        except Exception as e:
+            print(f"✗ processed_events maintenance failed: {e}")
+        schedule_maintenance(connection)
+    
+    connection.call_later(settings.PROCESSED_EVENTS_PRUNE_INTERVAL_SECONDS, run)
+
+
+def start_consumer(partition: Optional[int] = None):
     """
     Start RabbitMQ consumer
     
     Connects to RabbitMQ and starts consuming OrderCreated events
+    
+    Args:
+        partition: Partition queue to consume (see run_partitioned_consumers);
+            None consumes the shared queue
     """
+    queue = settings.RABBITMQ_QUEUE if partition is None else partition_queue_name(partition)
+    metrics_port = settings.CONSUMER_METRICS_PORT + (partition or 0)
+    
     try:
+        # Expose consumer metrics (idempotency checks, processed_events size)
+        start_http_server(metrics_port)
+        print(f"✓ Consumer metrics on port {metrics_port}")
+        
+        # Prune expired events and export table metrics before consuming
+        maintain_processed_events()
+        
         # Connect to RabbitMQ
         print(f"Connecting to RabbitMQ: {settings.RABBITMQ_URL}")
         connection = pika.BlockingConnection(
@@ -68,41 +181,60 @@ def start_consumer():
         )
         channel = connection.channel()
         
-        # Declare exchange
-        channel.exchange_declare(
-            exchange=settings.RABBITMQ_EXCHANGE,
-            exchange_type='topic',
-            durable=True
-        )
-        print(f"✓ Exchange declared: {settings.RABBITMQ_EXCHANGE}")
-        
-        # Declare queue
+        # Declare queue (partition queues are bound by the supervisor)
         channel.queue_declare(
-            queue=settings.RABBITMQ_QUEUE,
+            queue=queue,
             durable=True
         )
-        print(f"✓ Queue declared: {settings.RABBITMQ_QUEUE}")
+        print(f"✓ Queue declared: {queue}")
         
-        # Bind queue to exchange
-        channel.queue_bind(
-            exchange=settings.RABBITMQ_EXCHANGE,
-            queue=settings.RABBITMQ_QUEUE,
-            routing_key=settings.RABBITMQ_ROUTING_KEY
-        )
-        print(f"✓ Queue bound to exchange with routing key: {settings.RABBITMQ_ROUTING_KEY}")
+        if partition is None:
+            # Declare exchange
+            channel.exchange_declare(
+                exchange=settings.RABBITMQ_EXCHANGE,
+                exchange_type='topic',
+                durable=True
+            )
+            print(f"✓ Exchange declared: {settings.RABBITMQ_EXCHANGE}")
+            
+            # Bind queue to exchange
+            channel.queue_bind(
+                exchange=settings.RABBITMQ_EXCHANGE,
+                queue=queue,
+                routing_key=settings.RABBITMQ_ROUTING_KEY
+            )
+            print(f"✓ Queue bound to exchange with routing key: {settings.RABBITMQ_ROUTING_KEY}")
+            
+            # Undo an earlier partitioned run so events are not routed twice
+            unbind_partitions(connection)
+        
+        # Set prefetch count (QoS) - a full batch must fit in flight
+        channel.basic_qos(prefetch_count=max(10, settings.CONSUMER_BATCH_SIZE))
         
-        # Set prefetch count (QoS)
-        channel.basic_qos(prefetch_count=10)
+        # Periodic processed_events retention pruning (runs between messages)
+        schedule_maintenance(connection)
+        
+        # Start consuming (micro-batched unless CONSUMER_BATCH_SIZE=1)
+        if settings.CONSUMER_BATCH_SIZE > 1:
+            batcher = BatchConsumer(
+                connection,
+                channel,
+                settings.CONSUMER_BATCH_SIZE,
+                settings.CONSUMER_BATCH_MAX_WAIT_MS
+            )
+            on_message = batcher.on_message
+            print(f"✓ Batch mode: up to {settings.CONSUMER_BATCH_SIZE} events / {settings.CONSUMER_BATCH_MAX_WAIT_MS} ms")
+        else:
+            on_message = callback
         
-        # Start consuming
         channel.basic_consume(
-            queue=settings.RABBITMQ_QUEUE,
-            on_message_callback=callback,
+            queue=queue,
+            on_message_callback=on_message,
             auto_ack=False  # Manual acknowledgement
         )
         
         print(f"✓ {settings.SERVICE_NAME} Consumer started")
-        print(f"✓ Waiting for OrderCreated events on queue: {settings.RABBITMQ_QUEUE}")
+        print(f"✓ Waiting for OrderCreated events on queue: {queue}")
         print("Press CTRL+C to exit")
         
         channel.start_consuming()
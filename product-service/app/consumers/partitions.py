@@ -0,0 +1,208 @@
+"""
+Partitioned OrderCreated consumption
+
+Events are routed by consistent hash of their product_id header into
+CONSUMER_PARTITIONS queues, and run_partitioned_consumers() runs one worker
+process per queue. All events of a product are applied by one worker in
+publish order, and workers never contend for the same product rows.
+"""
+import multiprocessing
+import os
+import signal
+import time
+from typing import Dict, Optional
+import pika
+
+from app.config import settings
+
+# Minimum delay between restarts of a crashed worker
+WORKER_RESTART_DELAY_SECONDS = 5.0
+
+
+def partition_queue_name(partition: int) -> str:
+    """Queue of a partition, e.g. order.created.product.3"""
+    return f"{settings.RABBITMQ_QUEUE}.{partition}"
+
+
+def _queue_depth(connection, queue: str) -> Optional[int]:
+    """Messages in queue, or None if it does not exist (checked on a throwaway channel)"""
+    channel = connection.channel()
+    try:
+        return channel.queue_declare(queue=queue, passive=True).method.message_count
+    except pika.exceptions.ChannelClosedByBroker:
+        return None
+    finally:
+        if channel.is_open:
+            channel.close()
+
+
+def declare_partitions(connection, partitions: int) -> None:
+    """
+    Declare the partition exchange and queues
+    
+    The consistent-hash exchange (rabbitmq_consistent_hash_exchange plugin)
+    is bound to the orders exchange with the OrderCreated routing key and
+    hashes the product_id header. Every partition queue gets the same weight.
+    
+    The shared queue and partition queues left over from a larger N are
+    unbound, so events are neither consumed twice nor routed to queues
+    without a worker. Messages already in them are left in place.
+    
+    Args:
+        connection: pika BlockingConnection
+        partitions: Number of partitions
+    """
+    channel = connection.channel()
+    
+    channel.exchange_declare(
+        exchange=settings.RABBITMQ_EXCHANGE,
+        exchange_type='topic',
+        durable=True
+    )
+    channel.exchange_declare(
+        exchange=settings.RABBITMQ_PARTITION_EXCHANGE,
+        exchange_type='x-consistent-hash',
+        durable=True,
+        arguments={"hash-header": "product_id"}
+    )
+    channel.exchange_bind(
+        destination=settings.RABBITMQ_PARTITION_EXCHANGE,
+        source=settings.RABBITMQ_EXCHANGE,
+        routing_key=settings.RABBITMQ_ROUTING_KEY
+    )
+    print(f"✓ Partition exchange declared: {settings.RABBITMQ_PARTITION_EXCHANGE}")
+    
+    for partition in range(partitions):
+        queue = partition_queue_name(partition)
+        channel.queue_declare(queue=queue, durable=True)
+        # The routing key is the queue's weight on the hash ring
+        channel.queue_bind(exchange=settings.RABBITMQ_PARTITION_EXCHANGE, queue=queue, routing_key="1")
+    print(f"✓ {partitions} partition queues declared: {partition_queue_name(0)} .. {partition_queue_name(partitions - 1)}")
+    
+    depth = _queue_depth(connection, settings.RABBITMQ_QUEUE)
+    if depth is not None:
+        channel.queue_unbind(
+            queue=settings.RABBITMQ_QUEUE,
+            exchange=settings.RABBITMQ_EXCHANGE,
+            routing_key=settings.RABBITMQ_ROUTING_KEY
+        )
+        if depth:
+            print(f"Warning: {depth} messages left in unbound queue {settings.RABBITMQ_QUEUE}")
+    
+    partition = partitions
+    while (depth := _queue_depth(connection, partition_queue_name(partition))) is not None:
+        channel.queue_unbind(
+            queue=partition_queue_name(partition),
+            exchange=settings.RABBITMQ_PARTITION_EXCHANGE,
+            routing_key="1"
+        )
+        if depth:
+            print(f"Warning: {depth} messages left in unbound queue {partition_queue_name(partition)}")
+        partition += 1
+    
+    channel.close()
+
+
+def unbind_partitions(connection) -> None:
+    """
+    Stop routing OrderCreated events to partition queues
+    
+    Reverses declare_partitions when the shared queue is consumed again:
+    the partition exchange is unbound from the orders exchange, so events
+    are not routed to both. Messages already in partition queues are left
+    in place.
+    
+    Args:
+        connection: pika BlockingConnection
+    """
+    channel = connection.channel()
+    try:
+        channel.exchange_declare(exchange=settings.RABBITMQ_PARTITION_EXCHANGE, passive=True)
+    except pika.exceptions.ChannelClosedByBroker:
+        return  # Never partitioned
+    
+    channel.exchange_unbind(
+        destination=settings.RABBITMQ_PARTITION_EXCHANGE,
+        source=settings.RABBITMQ_EXCHANGE,
+        routing_key=settings.RABBITMQ_ROUTING_KEY
+    )
+    channel.close()
+    print(f"✓ Partition exchange unbound: {settings.RABBITMQ_PARTITION_EXCHANGE}")
+    
+    partition = 0
+    while (depth := _queue_depth(connection, partition_queue_name(partition))) is not None:
+        if depth:
+            print(f"Warning: {depth} messages left in unbound queue {partition_queue_name(partition)}")
+        partition += 1
+
+
+def _run_worker(partition: int) -> None:
+    """Worker process: consume one partition queue"""
+    if settings.CONSUMER_MODE == "async":
+        from app.consumers.async_order_consumer import start_async_consumer
+        start_async_consumer(partition)
+    else:
+        from app.consumers.order_consumer import start_consumer
+        start_consumer(partition)
+
+
+def run_partitioned_consumers(partitions: int) -> None:
+    """
+    Declare the partition topology and supervise one worker per partition
+    
+    Workers that exit are restarted. SIGINT/SIGTERM are forwarded to the
+    workers as SIGINT; they get CONSUMER_SHUTDOWN_TIMEOUT_SECONDS to stop
+    before they are terminated.
+    
+    Args:
+        partitions: Number of partitions (worker processes)
+    """
+    connection = pika.BlockingConnection(pika.URLParameters(settings.RABBITMQ_URL))
+    try:
+        declare_partitions(connection, partitions)
+    finally:
+        connection.close()
+    
+    context = multiprocessing.get_context("spawn")
+    workers: Dict[int, multiprocessing.Process] = {}
+    started_at: Dict[int, float] = {}
+    stopping = False
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+    
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    
+    def spawn(partition: int) -> None:
+        process = context.Process(target=_run_worker, args=(partition,), name=f"consumer-{partition}")
+        process.start()
+        workers[partition] = process
+        started_at[partition] = time.monotonic()
+        print(f"✓ Consumer for partition {partition} started (pid {process.pid})")
+    
+    for partition in range(partitions):
+        spawn(partition)
+    
+    while not stopping:
+        time.sleep(1)
+        for partition, process in list(workers.items()):
+            if stopping or process.is_alive():
+                continue
+            if time.monotonic() - started_at[partition] < WORKER_RESTART_DELAY_SECONDS:
+                continue
+            print(f"✗ Consumer for partition {partition} exited with code {process.exitcode}, restarting")
+            spawn(partition)
+    
+    print("\nStopping partition consumers...")
+    for process in workers.values():
+        if process.is_alive():
+            os.kill(process.pid, signal.SIGINT)
+    
+    deadline = time.monotonic() + settings.CONSUMER_SHUTDOWN_TIMEOUT_SECONDS
+    for process in workers.values():
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            process.terminate()
+    print("Consumers stopped")
\ No newline at end of file
@@ -1,21 +1,53 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+import itertools
+import time
+from fastapi import Request
+from prometheus_client import Counter, Gauge
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from typing import Generator, AsyncGenerator, List, Optional
 
 from app.config import settings
+from app.pools import pool_sizes, instrument_engine, check_connection_budget, InstrumentedQueuePool, InstrumentedAsyncQueuePool
+
+# Prometheus metrics (exposed on /metrics)
+READ_SESSIONS = Counter(
+    "db_read_sessions_total",
+    "Read-only sessions by target",
+    ["target"]  # primary | replica
+)
+REPLICA_LAG = Gauge("db_replica_lag_seconds", "Replication lag of a read replica", ["replica"])
+REPLICA_HEALTHY = Gauge("db_replica_healthy", "Whether a read replica serves reads", ["replica"])
+
+# Cookie pinning a client's reads to the primary after it wrote (read-your-writes)
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+# Replication lag in seconds (0 when all received WAL is replayed, NULL on a primary)
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+# Pool sizes per engine: in async mode the sync and async engines share the budget
+POOL_SIZES = pool_sizes(engines=2 if settings.DATABASE_MODE == "async" else 1)
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Enable connection health checks
-    pool_size=10,        # Connection pool size
-    max_overflow=20,     # Max connections beyond pool_size
-    echo=False           # Set to True for SQL query logging
+    poolclass=InstrumentedQueuePool,
+    pool_pre_ping=True,                         # Enable connection health checks
+    pool_size=POOL_SIZES.pool_size,             # Connection pool size
+    max_overflow=POOL_SIZES.max_overflow,       # Max connections beyond pool_size
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    echo=False                                  # Set to True for SQL query logging
 )
+instrument_engine(engine, "primary")
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(
@@ -24,13 +56,164 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+
+def _async_database_url(url: str) -> str:
+    """Derive asyncpg connection URL from a psycopg2 DATABASE_URL"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+# Create async SQLAlchemy engine (used when DATABASE_MODE=async)
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL),
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_pre_ping=True,
+    pool_size=POOL_SIZES.pool_size,
+    max_overflow=POOL_SIZES.max_overflow,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    echo=False
+)
+instrument_engine(async_engine, "async")
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Read replica engines (DATABASE_REPLICA_URLS), same index in both lists
+replica_urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+replica_engines = [
+    create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_size=POOL_SIZES.pool_size,
+        max_overflow=POOL_SIZES.max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        connect_args={"connect_timeout": 2},  # Fail over quickly when a replica is down
+        echo=False
+    )
+    for url in replica_urls
+]
+async_replica_engines = [
+    create_async_engine(
+        _async_database_url(url),
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_pre_ping=True,
+        pool_size=POOL_SIZES.pool_size,
+        max_overflow=POOL_SIZES.max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        connect_args={"timeout": 2},
+        echo=False
+    )
+    for url in replica_urls
+]
+for index, replica_engine in enumerate(replica_engines):
+    instrument_engine(replica_engine, f"replica{index}")
+for index, replica_engine in enumerate(async_replica_engines):
+    instrument_engine(replica_engine, f"async_replica{index}")
+
+
+class ReplicaRouter:
+    """
+    Picks the database for read-only sessions
+    
+    Replicas are used round-robin while healthy: reachable and at most
+    max_lag_seconds behind the primary, as measured by check() (run every
+    REPLICA_CHECK_INTERVAL_SECONDS). Replicas start unhealthy until the
+    first check; with no healthy replica, reads go to the primary.
+    """
+    
+    def __init__(self, engines: list, max_lag_seconds: float):
+        self.engines = engines
+        self.max_lag_seconds = max_lag_seconds
+        self._healthy: List[int] = []
+        self._lag: List[Optional[float]] = [None] * len(engines)
+        self._counter = itertools.count()
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether any replicas are configured"""
+        return bool(self.engines)
+    
+    def choose(self) -> Optional[int]:
+        """Index of the replica for the next read session (None: use the primary)"""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+    
+    def check(self) -> None:
+        """Measure replication lag of every replica and update the healthy set"""
+        healthy = []
+        for index, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as conn:
+                    lag = float(conn.execute(text(REPLICA_LAG_SQL)).scalar() or 0)
+            except Exception as e:
+                print(f"✗ Replica {index} unreachable: {e}")
+                lag = None
+            
+            is_healthy = lag is not None and lag <= self.max_lag_seconds
+            if is_healthy:
+                healthy.append(index)
+            if is_healthy != (index in self._healthy):
+                print(f"{'✓' if is_healthy else '✗'} Replica {index} {'serving reads' if is_healthy else 'skipped'} (lag: {lag})")
+            
+            self._lag[index] = lag
+            REPLICA_LAG.labels(replica=str(index)).set(lag if lag is not None else float("nan"))
+            REPLICA_HEALTHY.labels(replica=str(index)).set(1 if is_healthy else 0)
+        
+        self._healthy = healthy
+    
+    def status(self) -> List[dict]:
+        """Health of every replica (for /health)"""
+        return [
+            {"replica": index, "healthy": index in self._healthy, "lag_seconds": self._lag[index]}
+            for index in range(len(self.engines))
+        ]
+
+
+# Global router used by the read session dependencies
+replica_router = ReplicaRouter(replica_engines, settings.REPLICA_MAX_LAG_SECONDS)
+
+
+def _read_replica(request: Request) -> Optional[int]:
+    """Replica for a read request, None if it must use the primary"""
+    if not replica_router.enabled:
+        return None
+    
+    # Read-your-writes: the client wrote recently
+    try:
+        if float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time():
+            READ_SESSIONS.labels(target="primary").inc()
+            return None
+    except ValueError:
+        pass
+    
+    replica = replica_router.choose()
+    READ_SESSIONS.labels(target="primary" if replica is None else "replica").inc()
+    return replica
+
 # Create Base class for models
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_request_wrote(session: Session) -> None:
+    """Flag the request of a committing session (read-your-writes pin)"""
+    request_state = session.info.get("request_state")
+    if request_state is not None:
+        request_state.wrote = True
+
+
+def get_db(request: Request) -> Generator[Session, None, None]:
     """
-    Dependency function to get database session
+    Dependency function to get database session (primary)
     
     Usage:
         @app.get("/products")
@@ -38,15 +221,76 @@ def get_db() -> Generator[Session, None, None]:
             ...
     """
     db = SessionLocal()
+    db.info["request_state"] = request.state
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency function to get a read-only database session
+    
+    Served by a healthy read replica unless the client wrote within
+    READ_YOUR_WRITES_SECONDS or no replica is configured/healthy.
+    
+    Usage:
+        @app.get("/products")
+        def get_products(db: Session = Depends(get_read_db)):
+            ...
+    """
+    replica = _read_replica(request)
+    db = SessionLocal() if replica is None else SessionLocal(bind=replica_engines[replica])
     try:
         yield db
     finally:
         db.close()
 
 
-def init_db():
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get async database session
+    
+    Usage:
+        @app.get("/products/{product_id}")
+        async def get_product(db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency function to get a read-only async session (see get_read_db)"""
+    replica = _read_replica(request)
+    bind = async_engine if replica is None else async_replica_engines[replica]
+    async with AsyncSessionLocal(bind=bind) as db:
+        yield db
+
+
+def ping_database() -> None:
+    """Run SELECT 1 on a pooled connection (health probe)"""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def warm_up_database():
     """
-    Initialize database - create all tables
-    Call this on application startup
+    Check the schema version and open DATABASE_WARMUP_CONNECTIONS pooled connections
+    
+    Runs as a readiness check (see app.readiness), so the first requests
+    neither pay connection setup nor hit an unmigrated database.
+    
+    Raises:
+        SchemaVersionError: If the database is not migrated to this build's revision
     """
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    from app.schema import check_schema_version
+    
+    connections = [engine.connect() for _ in range(max(1, settings.DATABASE_WARMUP_CONNECTIONS))]
+    try:
+        check_schema_version(connections[0])
+        check_connection_budget(connections[0])
+    finally:
+        for connection in connections:
+            connection.close()
\ No newline at end of file
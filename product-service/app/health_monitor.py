@@ -0,0 +1,65 @@
+"""
+Dependency health snapshot refreshed in the background (served by GET /health)
+"""
+import time
+from typing import Callable, Dict
+from prometheus_client import Gauge
+
+from app.config import settings
+
+# Prometheus metrics (exposed on /metrics)
+DEPENDENCY_HEALTHY = Gauge("dependency_healthy", "Whether the last probe of a dependency succeeded", ["dependency"])
+
+
+class HealthMonitor:
+    """
+    Probes dependencies and keeps the last result of each
+    
+    refresh() runs every HEALTH_CHECK_INTERVAL_SECONDS in a background task;
+    GET /health only reads the snapshot, so it answers in microseconds and
+    health checks neither load the database nor fan out to other services.
+    Every dependency reports the age of its status; a status older than
+    stale_after_seconds is reported unhealthy (the probe is stuck).
+    """
+    
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.stale_after_seconds = 3 * interval_seconds
+        self._probes: Dict[str, Callable[[], None]] = {}
+        self._results: Dict[str, tuple] = {}  # name -> (status, checked_at, latency_ms)
+    
+    def add(self, name: str, probe: Callable[[], None]) -> None:
+        """Register a probe (raises on failure)"""
+        self._probes[name] = probe
+    
+    def refresh(self) -> None:
+        """Run every probe and store the results"""
+        for name, probe in self._probes.items():
+            start = time.perf_counter()
+            try:
+                probe()
+                status = "healthy"
+            except Exception as e:
+                status = f"unhealthy: {e}"
+            latency_ms = (time.perf_counter() - start) * 1000
+            self._results[name] = (status, time.monotonic(), latency_ms)
+            DEPENDENCY_HEALTHY.labels(name).set(1 if status == "healthy" else 0)
+    
+    def snapshot(self) -> Dict[str, dict]:
+        """Last status of every dependency with its age in seconds and probe latency"""
+        now = time.monotonic()
+        checks = {}
+        for name in self._probes:
+            if name not in self._results:
+                checks[name] = {"status": "unknown: not checked yet", "age_seconds": None, "latency_ms": None}
+                continue
+            status, checked_at, latency_ms = self._results[name]
+            age = now - checked_at
+            if age > self.stale_after_seconds:
+                status = f"unhealthy: last checked {age:.0f}s ago"
+            checks[name] = {"status": status, "age_seconds": round(age, 3), "latency_ms": round(latency_ms, 2)}
+        return checks
+
+
+# Global health snapshot (probes registered in app.main)
+health_monitor = HealthMonitor(settings.HEALTH_CHECK_INTERVAL_SECONDS)
\ No newline at end of file
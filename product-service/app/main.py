@@ -1,13 +1,23 @@
 """
 FastAPI Application Entry Point - Product Service
 """
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.config import settings
-from app.database import init_db
-from app.api import products, health
+from app.database import warm_up_database, ping_database, async_engine, async_replica_engines, replica_router, READ_PRIMARY_COOKIE, POOL_SIZES
+from app.api import products, reservations, health
+from app.background import PeriodicTask
+from app.readiness import readiness
+from app.pools import configure_threadpool
+from app.health_monitor import health_monitor
+from app.services.product_cache import product_cache, ProductCacheListener
+from app.services.reservation_service import sweep_expired_reservations
+from app.services.category_stats_service import refresh_category_stats
+from app.services.total_counter import drop_unmaintained_counter
+from app.models.product import Product
 
 # Create FastAPI application
 app = FastAPI(
@@ -27,24 +37,106 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """Pin the client's reads to the primary for READ_YOUR_WRITES_SECONDS after it wrote"""
+    response = await call_next(request)
+    if replica_router.enabled and getattr(request.state, "wrote", False):
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(time.time() + settings.READ_YOUR_WRITES_SECONDS),
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax"
+        )
+    return response
+
+
 # Include routers
 app.include_router(health.router)
 app.include_router(products.router)
+app.include_router(reservations.router)
 
 # Prometheus metrics
 Instrumentator().instrument(app).expose(app)
 
+# GET /ready: schema at this build's revision, connection pool warm
+readiness.add("database", warm_up_database)
+
+# GET /health snapshot
+health_monitor.add("database", ping_database)
+health_checker = PeriodicTask(
+    "health-checker",
+    health_monitor.refresh,
+    settings.HEALTH_CHECK_INTERVAL_SECONDS
+)
+
+# Invalidates the product read cache on changes made by other processes
+cache_listener = ProductCacheListener(product_cache)
+
+# Measures replica lag; lagging or unreachable replicas stop serving reads
+replica_checker = PeriodicTask(
+    "replica-checker",
+    replica_router.check,
+    settings.REPLICA_CHECK_INTERVAL_SECONDS
+)
+
+# Returns stock of expired reservations
+reservation_sweeper = PeriodicTask(
+    "reservation-sweeper",
+    sweep_expired_reservations,
+    settings.RESERVATION_SWEEP_INTERVAL_SECONDS
+)
+
+# Recomputes per-category statistics (GET /products/stats)
+category_stats_refresher = PeriodicTask(
+    "category-stats-refresher",
+    refresh_category_stats,
+    settings.CATEGORY_STATS_REFRESH_INTERVAL_SECONDS
+)
+
 
 @app.on_event("startup")
 def startup_event():
-    """Initialize database on startup"""
+    """Warm up connections and start background tasks (schema is migrated by migrate.py)"""
     print(f"Starting {settings.SERVICE_NAME}...")
-    init_db()
-    print(f"✓ Database initialized")
+    configure_threadpool(POOL_SIZES.threadpool_size)
+    print(
+        f"✓ Pools: {POOL_SIZES.pool_size} + {POOL_SIZES.max_overflow} overflow connections, "
+        f"{POOL_SIZES.threadpool_size} threads{' (autosized)' if settings.DB_POOL_AUTOSIZE else ''}"
+    )
+    if readiness.run():
+        print(f"✓ Database ready (mode: {settings.DATABASE_MODE})")
+        drop_unmaintained_counter(Product)
+    else:
+        # Not fatal: GET /ready keeps retrying and reports 503 meanwhile
+        print(f"✗ Not ready yet: {readiness.status()}")
+    health_monitor.refresh()
+    health_checker.start()
+    if product_cache.enabled:
+        cache_listener.start()
+        print(f"✓ Product cache enabled (size: {settings.PRODUCT_CACHE_MAX_SIZE}, ttl: {settings.PRODUCT_CACHE_TTL_SECONDS}s)")
+    if replica_router.enabled:
+        replica_router.check()
+        replica_checker.start()
+        print(f"✓ Read replicas: {len(replica_router.engines)} (max lag: {settings.REPLICA_MAX_LAG_SECONDS}s)")
+    reservation_sweeper.start()
+    print(f"✓ Reservation sweeper started (every {settings.RESERVATION_SWEEP_INTERVAL_SECONDS}s)")
+    category_stats_refresher.start()
+    print(f"✓ Category statistics refresher started (every {settings.CATEGORY_STATS_REFRESH_INTERVAL_SECONDS}s)")
     print(f"✓ {settings.SERVICE_NAME} is running on port {settings.SERVICE_PORT}")
 
 
 @app.on_event("shutdown")
-def shutdown_event():
+async def shutdown_event():
     """Cleanup on shutdown"""
-    print(f"Shutting down {settings.SERVICE_NAME}...")
\ No newline at end of file
+    print(f"Shutting down {settings.SERVICE_NAME}...")
+    cache_listener.stop()
+    health_checker.stop()
+    replica_checker.stop()
+    reservation_sweeper.stop()
+    category_stats_refresher.stop()
+    await async_engine.dispose()
+    for replica_engine in async_replica_engines:
+        await replica_engine.dispose()
\ No newline at end of file
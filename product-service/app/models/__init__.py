@@ -1,6 +1,9 @@
 """
 Models package
 """
-from app.models.product import Product, ProcessedEvent
+from app.models.product import Product, ProductStockBucket, ProcessedEvent
+from app.models.row_count import RowCount
+from app.models.reservation import StockReservation
+from app.models.catalog_version import CatalogVersion
 
-__all__ = ["Product", "ProcessedEvent"]
\ No newline at end of file
+__all__ = ["Product", "ProductStockBucket", "ProcessedEvent", "RowCount", "StockReservation", "CatalogVersion"]
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+SQLAlchemy CatalogVersion model
+"""
+from sqlalchemy import Column, SmallInteger, BigInteger
+from app.database import Base
+
+# Shards of the catalog version (rows seeded by migration 0011)
+CATALOG_VERSION_SHARDS = 16
+
+
+class CatalogVersion(Base):
+    """
+    One shard of the catalog version (list page ETags)
+    
+    Statement triggers add 1 once per transaction to a shard no other
+    writer holds: to version when products are inserted, deleted or edited,
+    to stock_version when stock or stock buckets change. The sum of each
+    column over all shards changes with every committed write of its kind.
+    """
+    
+    __tablename__ = "catalog_version"
+    
+    shard = Column(SmallInteger, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    stock_version = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<CatalogVersion(shard={self.shard}, version={self.version})>"
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Per-category catalog statistics (materialized view)
+"""
+from sqlalchemy import Table, MetaData, Column, String, BigInteger, Float, DateTime
+
+# Not part of Base.metadata: the view is created by migrations (not autogenerated
+# as a table). Striped products count the sum of their buckets; the unique index
+# on category lets it be refreshed CONCURRENTLY.
+view_metadata = MetaData()
+
+CATEGORY_STATS_VIEW = "product_category_stats"
+
+# Read-only mapping of the view's columns for queries
+product_category_stats = Table(
+    CATEGORY_STATS_VIEW,
+    view_metadata,
+    Column("category", String(100)),
+    Column("product_count", BigInteger),
+    Column("total_stock", BigInteger),
+    Column("out_of_stock_count", BigInteger),
+    Column("min_price", Float),
+    Column("avg_price", Float),
+    Column("max_price", Float),
+    Column("refreshed_at", DateTime(timezone=True)),
+)
\ No newline at end of file
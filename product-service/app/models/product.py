@@ -1,8 +1,11 @@
 """
 SQLAlchemy Product model
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, CheckConstraint
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, CheckConstraint, Index, Computed, ForeignKey
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
+from app.config import settings
 from app.database import Base
 
 
@@ -12,33 +15,77 @@ class Product(Base):
     __tablename__ = "products"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    sku = Column(String(64), nullable=True, unique=True)  # Natural key for bulk imports
     name = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
     price = Column(Float, nullable=False)
     stock = Column(Integer, nullable=False, default=0)
+    stock_buckets = Column(Integer, nullable=False, default=0, server_default="0")  # >0: stock is striped across buckets
     category = Column(String(100), nullable=True, index=True)
     image_url = Column(String(500), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
+    # Full-text search document (name weighted above description), maintained by Postgres
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{settings.SEARCH_TEXT_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{settings.SEARCH_TEXT_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
+    
     # Constraints
     __table_args__ = (
         CheckConstraint('price >= 0', name='check_price_positive'),
         CheckConstraint('stock >= 0', name='check_stock_non_negative'),
+        CheckConstraint('stock_buckets >= 0', name='check_stock_buckets_non_negative'),
+        Index('ix_products_category_id', 'category', 'id'),  # Keyset pagination within a category
+        Index('ix_products_search_vector', 'search_vector', postgresql_using='gin'),
     )
     
     def __repr__(self):
         return f"<Product(id={self.id}, name='{self.name}', price={self.price}, stock={self.stock})>"
 
 
+class ProductStockBucket(Base):
+    """
+    One stripe of a hot product's stock
+    
+    When Product.stock_buckets > 0, the product's stock is the sum of its
+    buckets (products.stock stays 0), so concurrent decrements lock
+    different rows instead of queueing on the product row.
+    """
+    
+    __tablename__ = "product_stock_buckets"
+    
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    stock = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        CheckConstraint('stock >= 0', name='check_bucket_stock_non_negative'),
+    )
+    
+    def __repr__(self):
+        return f"<ProductStockBucket(product_id={self.product_id}, bucket={self.bucket}, stock={self.stock})>"
+
+
+# Channel used to broadcast product changes (in-process cache invalidation),
+# notified by the products_notify_changed and product_stock_buckets_notify_changed
+# triggers (see migrations)
+PRODUCT_CHANGED_CHANNEL = "product_changed"
+
+
 class ProcessedEvent(Base):
     """Table to track processed RabbitMQ events for idempotency"""
     
     __tablename__ = "processed_events"
     
-    event_id = Column(String(100), primary_key=True, unique=True, nullable=False)
+    event_id = Column(String(100), primary_key=True, nullable=False)
     event_type = Column(String(100), nullable=False)
-    processed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    processed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)  # Retention pruning
     
     def __repr__(self):
         return f"<ProcessedEvent(event_id='{self.event_id}', event_type='{self.event_type}')>"
\ No newline at end of file
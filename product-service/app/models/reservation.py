@@ -0,0 +1,40 @@
+"""
+SQLAlchemy StockReservation model
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CheckConstraint, Index, text
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class StockReservation(Base):
+    """
+    Temporary hold on product stock
+    
+    Stock is taken from the product when the hold is created, so every stock
+    read already excludes active holds. A hold is confirmed by the order
+    consumer or released (explicitly or by the sweeper once expired), which
+    puts the stock back.
+    """
+    
+    __tablename__ = "stock_reservations"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="active")  # active | confirmed | released
+    order_id = Column(Integer, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Constraints
+    __table_args__ = (
+        CheckConstraint('quantity > 0', name='check_reservation_quantity_positive'),
+        # Sweeper scans only active holds, oldest expiry first
+        Index('ix_stock_reservations_active_expires_at', 'expires_at', postgresql_where=text("status = 'active'")),
+        # Imports subtract active holds per product
+        Index('ix_stock_reservations_active_product_id', 'product_id', postgresql_where=text("status = 'active'")),
+    )
+    
+    def __repr__(self):
+        return f"<StockReservation(id={self.id}, product_id={self.product_id}, quantity={self.quantity}, status='{self.status}')>"
@@ -0,0 +1,60 @@
+"""
+Readiness (GET /ready): warm-up checks that must pass before taking traffic
+"""
+import threading
+from typing import Callable, Dict, Optional
+
+
+class Readiness:
+    """
+    Named warm-up checks, each run until it passes once
+    
+    run() retries only the checks that have not passed yet, so once the
+    process is ready GET /ready does no I/O. Concurrent calls do not queue
+    up behind a slow check: they report the current state instead.
+    """
+    
+    def __init__(self):
+        self._checks: Dict[str, Callable[[], None]] = {}
+        self._errors: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, name: str, check: Callable[[], None]) -> None:
+        """Register a check (raises on failure)"""
+        self._checks[name] = check
+        self._errors[name] = "not checked yet"
+    
+    @property
+    def ready(self) -> bool:
+        """Whether every check has passed"""
+        return not any(self._errors.values())
+    
+    def run(self) -> bool:
+        """
+        Run the checks that have not passed yet
+        
+        Returns:
+            True if the process is ready
+        """
+        if self.ready or not self._lock.acquire(blocking=False):
+            return self.ready
+        try:
+            for name, check in self._checks.items():
+                if self._errors[name] is None:
+                    continue
+                try:
+                    check()
+                    self._errors[name] = None
+                except Exception as e:
+                    self._errors[name] = str(e)
+        finally:
+            self._lock.release()
+        return self.ready
+    
+    def status(self) -> Dict[str, str]:
+        """Result of every check ("ok" or the last error)"""
+        return {name: error or "ok" for name, error in self._errors.items()}
+
+
+# Global readiness of this process (checks registered in app.main)
+readiness = Readiness()
\ No newline at end of file
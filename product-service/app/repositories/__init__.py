@@ -2,5 +2,11 @@
 Repositories package
 """
 from app.repositories.product_repository import ProductRepository, ProcessedEventRepository
+from app.repositories.product_core_repository import ProductCoreRepository
+from app.repositories.async_product_repository import AsyncProductRepository
+from app.repositories.row_count_repository import RowCountRepository
+from app.repositories.stock_bucket_repository import StockBucketRepository
+from app.repositories.reservation_repository import ReservationRepository
+from app.repositories.category_stats_repository import CategoryStatsRepository
 
-__all__ = ["ProductRepository", "ProcessedEventRepository"]
\ No newline at end of file
+__all__ = ["ProductRepository", "ProcessedEventRepository", "ProductCoreRepository", "AsyncProductRepository", "RowCountRepository", "StockBucketRepository", "ReservationRepository", "CategoryStatsRepository"]
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Async Product Repository - Data Access Layer (asyncpg)
+"""
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.product import Product
+from app.repositories.stock_bucket_repository import bucket_totals_query
+
+
+class AsyncProductRepository:
+    """Async repository for Product read operations"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, product_id: int) -> Optional[Product]:
+        """Get product by ID"""
+        result = await self.db.execute(select(Product).where(Product.id == product_id))
+        product = result.scalars().first()
+        if product:
+            await self._load_striped_stock([product])
+        return product
+    
+    async def _load_striped_stock(self, products: List[Product]) -> List[Product]:
+        """Replace stock of striped products with the sum of their buckets"""
+        striped_ids = [p.id for p in products if p.stock_buckets]
+        if striped_ids:
+            result = await self.db.execute(bucket_totals_query(striped_ids))
+            totals = {product_id: int(total) for product_id, total in result}
+            for product in products:
+                if product.stock_buckets:
+                    set_committed_value(product, "stock", totals.get(product.id, 0))
+        return products
@@ -0,0 +1,44 @@
+"""
+Category Stats Repository - materialized per-category catalog statistics
+"""
+from typing import List
+from sqlalchemy import select, func, text
+from sqlalchemy.orm import Session
+
+from app.models.category_stats import product_category_stats, CATEGORY_STATS_VIEW
+
+# pg_try_advisory_xact_lock key: one refresh at a time across all API workers
+CATEGORY_STATS_REFRESH_LOCK = 7301
+
+
+class CategoryStatsRepository:
+    """Repository for the product_category_stats materialized view"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_all(self) -> List:
+        """Get one row per category (uncategorized last)"""
+        return self.db.execute(
+            select(product_category_stats)
+            .order_by(product_category_stats.c.category.asc().nulls_last())
+        ).all()
+    
+    def refresh(self) -> bool:
+        """
+        Recompute the view without blocking readers (REFRESH ... CONCURRENTLY)
+        
+        Skipped if another process is already refreshing. Commits.
+        
+        Returns:
+            True if the view was refreshed
+        """
+        locked = self.db.execute(
+            select(func.pg_try_advisory_xact_lock(CATEGORY_STATS_REFRESH_LOCK))
+        ).scalar()
+        if not locked:
+            self.db.rollback()
+            return False
+        self.db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {CATEGORY_STATS_VIEW}"))
+        self.db.commit()
+        return True
\ No newline at end of file
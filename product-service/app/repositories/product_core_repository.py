@@ -0,0 +1,115 @@
+"""
+Product Core Repository - ORM-free read path for hot endpoints
+"""
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import select, func, case, lambda_stmt, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.product import Product, ProductStockBucket
+
+products = Product.__table__
+
+# Effective stock: striped products report the sum of their buckets
+_bucket_stock = (
+    select(func.coalesce(func.sum(ProductStockBucket.stock), 0))
+    .where(ProductStockBucket.product_id == products.c.id)
+    .scalar_subquery()
+)
+EFFECTIVE_STOCK = case((products.c.stock_buckets > 0, _bucket_stock), else_=products.c.stock).label("stock")
+
+# Selectable columns by name (search_vector is never returned)
+_COLUMNS = {
+    column.name: EFFECTIVE_STOCK if column.name == "stock" else column
+    for column in products.c
+    if column.name != "search_vector"
+}
+ALL_COLUMNS = tuple(_COLUMNS.values())
+
+# id = ANY(:ids): one array parameter for any number of IDs
+_ID_IN_IDS = products.c.id == any_(bindparam("ids", type_=ARRAY(Integer)))
+
+
+@lru_cache(maxsize=64)
+def _columns(names: Optional[Tuple[str, ...]]) -> tuple:
+    """Column expressions for names (None: all), built once per fieldset"""
+    if names is None:
+        return ALL_COLUMNS
+    return tuple(_COLUMNS[name] for name in names)
+
+
+class ProductCoreRepository:
+    """
+    Read-only product queries returning plain rows instead of ORM objects
+    
+    Same read methods as ProductRepository, but statements are lambda_stmt
+    objects (built and cache-keyed once per call site, only parameters
+    change) executed on the session's connection, and rows skip identity
+    map bookkeeping and attribute instrumentation. Striped stock is summed
+    in the same statement. Rows support attribute access, so services and
+    ProductResponse.model_validate use them like products; they cannot be
+    modified.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        """Get all products with offset pagination (ordered by ID)"""
+        selected = _columns(None if columns is None else tuple(columns))
+        stmt = lambda_stmt(lambda: select(*selected))
+        if category is not None:
+            stmt += lambda s: s.where(products.c.category == category)
+        stmt += lambda s: s.order_by(products.c.id).offset(skip).limit(limit)
+        return self._execute(stmt).all()
+    
+    def get_page(
+        self,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        category: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        """Get products with keyset pagination (see ProductRepository.get_page)"""
+        selected = _columns(None if columns is None else tuple(columns))
+        stmt = lambda_stmt(lambda: select(*selected))
+        if category is not None:
+            stmt += lambda s: s.where(products.c.category == category)
+        if after_id is not None:
+            stmt += lambda s: s.where(products.c.id > after_id)
+        stmt += lambda s: s.order_by(products.c.id).limit(limit)
+        return self._execute(stmt).all()
+    
+    def get_by_id(self, product_id: int) -> Optional[Row]:
+        """Get product by ID"""
+        return self._execute(
+            lambda_stmt(lambda: select(*ALL_COLUMNS).where(products.c.id == product_id))
+        ).first()
+    
+    def get_by_ids(self, product_ids: Iterable[int]) -> List[Row]:
+        """
+        Get several products in one query
+        
+        Binds IDs as a single array parameter (id = ANY(:ids)), like
+        ProductRepository.get_by_ids, so the statement text is the same for
+        any batch size.
+        """
+        ids = list(product_ids)
+        if not ids:
+            return []
+        return self._execute(
+            lambda_stmt(lambda: select(*ALL_COLUMNS).where(_ID_IN_IDS)),
+            {"ids": ids}
+        ).all()
+    
+    def _execute(self, stmt, params: Optional[dict] = None):
+        """Execute on the session's connection (bypasses ORM statement handling)"""
+        return self.db.connection().execute(stmt, params)
\ No newline at end of file
@@ -1,12 +1,21 @@
 """
 Product Repository - Data Access Layer
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from datetime import timedelta
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import select, update, delete, func, any_, bindparam, literal_column, case, text, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import IntegrityError
 
+from app.config import settings
 from app.models.product import Product, ProcessedEvent
+from app.models.catalog_version import CatalogVersion
+from app.models.reservation import StockReservation
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.repositories.row_count_repository import RowCountRepository
+from app.repositories.stock_bucket_repository import StockBucketRepository
 
 
 class ProductRepository:
@@ -14,27 +23,171 @@ class ProductRepository:
     
     def __init__(self, db: Session):
         self.db = db
+        self.row_counts = RowCountRepository(db)
+        self.stock_buckets = StockBucketRepository(db)
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Product]:
-        """Get all products with pagination"""
-        return self.db.query(Product).offset(skip).limit(limit).all()
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> List[Product]:
+        """Get all products with offset pagination (ordered by ID), optionally loading only some columns"""
+        query = self._list_query(columns)
+        if category is not None:
+            query = query.filter(Product.category == category)
+        return self._load_striped_stock(query.order_by(Product.id).offset(skip).limit(limit).all())
+    
+    def get_page(
+        self,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        category: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> List[Product]:
+        """
+        Get products with keyset pagination
+        
+        Seeks directly to the first row after after_id using the primary key
+        (or the (category, id) index when filtering), so the cost of a page
+        does not depend on how deep it is.
+        
+        Args:
+            after_id: Last product ID of the previous page (None for the first page)
+            limit: Maximum number of products to return
+            category: Optional category filter
+            columns: Load only these attributes (None: all); the others are
+                not loaded and must not be accessed
+        """
+        query = self._list_query(columns)
+        if category is not None:
+            query = query.filter(Product.category == category)
+        if after_id is not None:
+            query = query.filter(Product.id > after_id)
+        return self._load_striped_stock(query.order_by(Product.id).limit(limit).all())
     
     def get_by_id(self, product_id: int) -> Optional[Product]:
         """Get product by ID"""
-        return self.db.query(Product).filter(Product.id == product_id).first()
+        product = self.db.query(Product).filter(Product.id == product_id).first()
+        if product:
+            self._load_striped_stock([product])
+        return product
+    
+    def get_by_ids(self, product_ids: Iterable[int]) -> List[Product]:
+        """
+        Get several products in one query
+        
+        Binds IDs as a single array parameter (id = ANY(:ids)), so the
+        statement text is the same for any batch size.
+        """
+        ids = list(product_ids)
+        if not ids:
+            return []
+        return self._load_striped_stock(self.db.query(Product).filter(
+            Product.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+        ).all())
     
     def get_by_category(self, category: str) -> List[Product]:
         """Get products by category"""
-        return self.db.query(Product).filter(Product.category == category).all()
+        return self._load_striped_stock(self.db.query(Product).filter(Product.category == category).all())
+    
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[Product]:
+        """
+        Full-text search over name and description
+        
+        Matches through the GIN index on search_vector and orders by relevance.
+        
+        Args:
+            query: Search terms (web search syntax: quotes, OR, -exclude)
+            category: Optional category filter
+            min_price: Optional minimum price
+            max_price: Optional maximum price
+            skip: Number of results to skip
+            limit: Maximum number of results
+        """
+        ts_query = func.websearch_to_tsquery(settings.SEARCH_TEXT_CONFIG, query)
+        rank = func.ts_rank_cd(Product.search_vector, ts_query)
+        
+        db_query = self.db.query(Product).filter(Product.search_vector.op("@@")(ts_query))
+        if category is not None:
+            db_query = db_query.filter(Product.category == category)
+        if min_price is not None:
+            db_query = db_query.filter(Product.price >= min_price)
+        if max_price is not None:
+            db_query = db_query.filter(Product.price <= max_price)
+        
+        return self._load_striped_stock(db_query.order_by(rank.desc(), Product.id).offset(skip).limit(limit).all())
     
     def create(self, product_data: ProductCreate) -> Product:
         """Create new product"""
         product = Product(**product_data.model_dump())
         self.db.add(product)
+        try:
+            self.db.flush()
+        except IntegrityError:
+            self.db.rollback()
+            raise ValueError(f"Product with sku={product_data.sku} already exists")
+        self.row_counts.increment(Product.__tablename__, 1)
         self.db.commit()
         self.db.refresh(product)
         return product
     
+    def upsert_many(self, rows: List[dict]) -> int:
+        """
+        Insert or update products by sku in one multi-row statement
+        
+        Executed as INSERT ... VALUES (...), (...) ON CONFLICT (sku) DO UPDATE
+        batches via executemany ("insertmanyvalues"), so the statement is
+        compiled once and a chunk needs a single commit. Stock of products
+        in striped mode is left as is (it is managed per bucket).
+        
+        The imported stock counts units on hand, including those held by
+        active reservations: holds took their units out of products.stock
+        and put them back on release, so they are subtracted here (never
+        below zero) to keep releases from adding them on top.
+        
+        Args:
+            rows: Product field dicts (each with a unique sku)
+        
+        Returns:
+            Number of newly inserted rows (the rest were updates)
+        """
+        held = (
+            select(func.coalesce(func.sum(StockReservation.quantity), 0))
+            .where(StockReservation.product_id == Product.id, StockReservation.status == "active")
+            .scalar_subquery()
+        )
+        stmt = insert(Product)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Product.sku],
+            set_={
+                "name": stmt.excluded.name,
+                "description": stmt.excluded.description,
+                "price": stmt.excluded.price,
+                "stock": case(
+                    (Product.stock_buckets == 0, func.greatest(stmt.excluded.stock - held, 0)),
+                    else_=Product.stock
+                ),
+                "category": stmt.excluded.category,
+                "image_url": stmt.excluded.image_url,
+                "updated_at": func.now(),
+            }
+        ).returning(literal_column("xmax = 0"))  # True for inserted rows
+        
+        inserted = sum(1 for (is_insert,) in self.db.execute(stmt, rows) if is_insert)
+        self.row_counts.increment(Product.__tablename__, inserted)
+        self.db.commit()
+        return inserted
+    
     def update(self, product_id: int, product_data: ProductUpdate) -> Optional[Product]:
         """Update existing product"""
         product = self.get_by_id(product_id)
@@ -43,11 +196,21 @@ class ProductRepository:
         
         # Update only provided fields
         update_data = product_data.model_dump(exclude_unset=True)
+        if "stock" in update_data:
+            # Lock the row so striping cannot be toggled meanwhile
+            self.db.refresh(product, with_for_update=True)
+            if product.stock_buckets:
+                self.stock_buckets.stripe(product_id, product.stock_buckets, update_data.pop("stock"))
         for field, value in update_data.items():
             setattr(product, field, value)
         
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise ValueError(f"Product with sku={product_data.sku} already exists")
         self.db.refresh(product)
+        self._load_striped_stock([product])
         return product
     
     def delete(self, product_id: int) -> bool:
@@ -57,32 +220,100 @@ class ProductRepository:
             return False
         
         self.db.delete(product)
+        self.row_counts.increment(Product.__tablename__, -1)
         self.db.commit()
         return True
     
-    def update_stock(self, product_id: int, quantity_change: int) -> Optional[Product]:
+    def update_stock(self, product_id: int, quantity_change: int, commit: bool = True) -> Optional[Product]:
         """
         Update product stock by adding/subtracting quantity
         
+        Uses a single conditional UPDATE ... RETURNING, so concurrent updates
+        cannot overwrite each other and a successful change costs one round trip.
+        Products in striped mode are updated through one of their stock
+        buckets instead, leaving the product row unlocked.
+        
         Args:
             product_id: Product ID
             quantity_change: Positive to add, negative to subtract
+            commit: Commit immediately (False to compose with other writes)
         
         Returns:
-            Updated product or None if product not found or stock becomes negative
+            Updated product or None if product not found
+        
+        Raises:
+            ValueError: If stock would become negative
         """
-        product = self.get_by_id(product_id)
+        product = self.db.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.stock_buckets == 0, Product.stock + quantity_change >= 0)
+            .values(stock=Product.stock + quantity_change)
+            .returning(Product)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).scalars().first()
+        
+        if product is None:
+            # No row updated: tell "not found" and "striped" apart from "insufficient stock"
+            current = self.db.execute(
+                select(Product).where(Product.id == product_id).execution_options(populate_existing=True)
+            ).scalars().first()
+            if current is None:
+                return None
+            if current.stock_buckets:
+                return self._update_striped_stock(current, quantity_change, commit)
+            raise ValueError(f"Insufficient stock. Current: {current.stock}, requested change: {quantity_change}")
+        
+        # Keep RETURNING values loaded instead of re-fetching after commit
+        self.db.expunge(product)
+        if commit:
+            self.db.commit()
+        return product
+    
+    def _update_striped_stock(self, product: Product, quantity_change: int, commit: bool) -> Optional[Product]:
+        """Apply stock change to one of a striped product's buckets"""
+        total = self.stock_buckets.change(product.id, quantity_change)
+        if total is None:
+            # Striping was turned off while we waited for the buckets (nothing was changed)
+            return self.update_stock(product.id, quantity_change, commit)
+        
+        set_committed_value(product, "stock", total)
+        self.db.expunge(product)
+        if commit:
+            self.db.commit()
+        return product
+    
+    def set_stock_buckets(self, product_id: int, bucket_count: int) -> Optional[Product]:
+        """
+        Turn striped stock on/off for a product or change its bucket count
+        
+        Current stock is preserved and spread evenly over the new buckets.
+        
+        Args:
+            product_id: Product ID
+            bucket_count: Number of buckets (0 disables striping)
+        
+        Returns:
+            Updated product or None if product not found
+        """
+        product = self.db.execute(
+            select(Product)
+            .where(Product.id == product_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).scalars().first()
         if not product:
             return None
         
-        new_stock = product.stock + quantity_change
-        
-        if new_stock < 0:
-            raise ValueError(f"Insufficient stock. Current: {product.stock}, requested change: {quantity_change}")
+        total = product.stock
+        if product.stock_buckets:
+            total = self.stock_buckets.lock_total(product_id) or 0
         
-        product.stock = new_stock
+        self.stock_buckets.stripe(product_id, bucket_count, total)
+        product.stock = 0 if bucket_count else total
+        product.stock_buckets = bucket_count
         self.db.commit()
         self.db.refresh(product)
+        self._load_striped_stock([product])
         return product
     
     def check_stock(self, product_id: int, required_quantity: int) -> bool:
@@ -92,30 +323,175 @@ class ProductRepository:
             return False
         return product.stock >= required_quantity
     
-    def count(self) -> int:
+    def count(self, category: Optional[str] = None) -> int:
         """Get total count of products"""
-        return self.db.query(Product).count()
+        query = self.db.query(Product)
+        if category is not None:
+            query = query.filter(Product.category == category)
+        return query.count()
+    
+    def catalog_version(self) -> Tuple[int, int]:
+        """
+        Current catalog versions
+        
+        Returns:
+            (version: changes with product inserts, deletes and edits,
+             stock version: changes with stock and stock bucket writes)
+        """
+        version, stock_version = self.db.execute(
+            select(func.sum(CatalogVersion.version), func.sum(CatalogVersion.stock_version))
+        ).one()
+        return version or 0, stock_version or 0
+    
+    def _list_query(self, columns: Optional[Sequence[str]]):
+        """Product query selecting all columns or only the given ones"""
+        query = self.db.query(Product)
+        if columns is not None:
+            query = query.options(load_only(*(getattr(Product, name) for name in columns)))
+        return query
+    
+    def _load_striped_stock(self, products: List[Product]) -> List[Product]:
+        """
+        Replace stock of striped products with the sum of their buckets
+        
+        The value is set as if loaded from the database, so it is never
+        written back to products.stock. Costs one extra query per call, and
+        only when striped products are present.
+        """
+        striped_ids = [p.id for p in products if p.stock_buckets]
+        if striped_ids:
+            totals = self.stock_buckets.totals(striped_ids)
+            for product in products:
+                if product.stock_buckets:
+                    set_committed_value(product, "stock", totals.get(product.id, 0))
+        return products
 
 
 class ProcessedEventRepository:
     """Repository for tracking processed events (idempotency)"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, event_filter=None):
+        """
+        Args:
+            db: Database session
+            event_filter: Optional in-memory front (ProcessedEventFilter) that
+                catches recent duplicates without a transaction
+        """
         self.db = db
+        self.event_filter = event_filter
+    
+    def is_recently_processed(self, event_id: str) -> bool:
+        """In-memory duplicate check only (no database access)"""
+        return self.event_filter is not None and self.event_filter.check_recent(event_id)
     
-    def is_processed(self, event_id: str) -> bool:
-        """Check if event was already processed"""
-        return self.db.query(ProcessedEvent).filter(
-            ProcessedEvent.event_id == event_id
+    def mark_processed(self, event_id: str, event_type: str, commit: bool = True) -> bool:
+        """
+        Record event as processed unless it already is
+        
+        A single INSERT ... ON CONFLICT DO NOTHING RETURNING that doubles as
+        the idempotency check. Run it in the same transaction as the event's
+        effects (commit=False), and a duplicate can never apply them twice.
+        
+        Args:
+            event_id: Event ID
+            event_type: Event type
+            commit: Commit immediately (False: caller commits, then calls remember())
+        
+        Returns:
+            True if newly recorded, False if the event was already processed
+        """
+        inserted = self.db.execute(
+            insert(ProcessedEvent)
+            .values(event_id=event_id, event_type=event_type)
+            .on_conflict_do_nothing(index_elements=[ProcessedEvent.event_id])
+            .returning(ProcessedEvent.event_id)
         ).first() is not None
+        if self.event_filter is not None:
+            self.event_filter.record_db_result(event_id, not inserted)
+        
+        if commit:
+            self.db.commit()
+            if inserted:
+                self.remember(event_id)
+        return inserted
     
-    def mark_processed(self, event_id: str, event_type: str) -> ProcessedEvent:
-        """Mark event as processed"""
-        processed_event = ProcessedEvent(
-            event_id=event_id,
-            event_type=event_type
-        )
-        self.db.add(processed_event)
-        self.db.commit()
-        self.db.refresh(processed_event)
-        return processed_event
\ No newline at end of file
+    def mark_processed_many(self, events: List[Tuple[str, str]]) -> Set[str]:
+        """
+        Record several events with one INSERT ... ON CONFLICT DO NOTHING RETURNING
+        
+        Does not commit (see mark_processed).
+        
+        Args:
+            events: (event_id, event_type) pairs with unique event IDs
+        
+        Returns:
+            IDs of newly recorded events (the others were already processed)
+        """
+        if not events:
+            return set()
+        
+        inserted = set(self.db.scalars(
+            insert(ProcessedEvent)
+            .values([{"event_id": event_id, "event_type": event_type} for event_id, event_type in events])
+            .on_conflict_do_nothing(index_elements=[ProcessedEvent.event_id])
+            .returning(ProcessedEvent.event_id)
+        ))
+        if self.event_filter is not None:
+            for event_id, _ in events:
+                self.event_filter.record_db_result(event_id, event_id not in inserted)
+        return inserted
+    
+    def remember(self, event_id: str) -> None:
+        """Add a committed event to the in-memory front"""
+        if self.event_filter is not None:
+            self.event_filter.add(event_id)
+    
+    def prune(self, retention_hours: int, batch_size: int) -> int:
+        """
+        Delete events processed before the retention window
+        
+        Deletes in batches (one commit each) through the processed_at index,
+        so pruning a large backlog never holds long locks.
+        
+        Returns:
+            Number of deleted events
+        """
+        cutoff = func.now() - timedelta(hours=retention_hours)
+        deleted = 0
+        while True:
+            expired = (
+                select(ProcessedEvent.event_id)
+                .where(ProcessedEvent.processed_at < cutoff)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = self.db.execute(
+                delete(ProcessedEvent)
+                .where(ProcessedEvent.event_id.in_(expired))
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+    
+    def table_stats(self) -> Tuple[Optional[int], int]:
+        """
+        Get size of the processed_events table
+        
+        Uses the planner estimate from pg_class.reltuples (kept current by
+        autovacuum) instead of counting every row.
+        
+        Returns:
+            (estimated row count or None if never analyzed, total bytes including indexes)
+        """
+        rows, size = self.db.execute(
+            text(
+                "SELECT reltuples::bigint, pg_total_relation_size(oid) "
+                "FROM pg_class WHERE oid = to_regclass(:table_name)"
+            ),
+            {"table_name": ProcessedEvent.__tablename__}
+        ).one()
+        if rows < 0:
+            rows = None
+        return rows, size
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Reservation Repository - Data Access Layer for stock holds
+"""
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, insert, update, func, case
+from sqlalchemy.orm import Session
+
+from app.models.reservation import StockReservation
+
+
+class ReservationRepository:
+    """
+    Repository for stock reservations
+    
+    Write methods do not commit - holds always change together with product
+    stock, so the caller commits both in one transaction.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_id(self, reservation_id: int, for_update: bool = False) -> Optional[StockReservation]:
+        """Get reservation by ID (optionally locking the row)"""
+        query = self.db.query(StockReservation).filter(StockReservation.id == reservation_id)
+        if for_update:
+            query = query.with_for_update().populate_existing()
+        return query.first()
+    
+    def create_many(self, holds: List[dict], ttl_seconds: int) -> List[StockReservation]:
+        """
+        Insert active holds with one INSERT ... RETURNING
+        
+        Expiry is computed from the database clock, which the sweeper
+        compares against as well.
+        
+        Args:
+            holds: Dicts with product_id and quantity
+            ttl_seconds: Hold duration
+        """
+        expires_at = func.now() + timedelta(seconds=ttl_seconds)
+        return list(self.db.scalars(
+            insert(StockReservation)
+            .values([
+                {"product_id": h["product_id"], "quantity": h["quantity"], "status": "active", "expires_at": expires_at}
+                for h in holds
+            ])
+            .returning(StockReservation)
+        ))
+    
+    def finish(self, reservation_id: int, new_status: str, order_id: Optional[int] = None) -> Optional[StockReservation]:
+        """
+        Move an active hold to confirmed/released
+        
+        The status check is part of the UPDATE, so a hold is finished exactly
+        once even when the consumer, a client and the sweeper race for it.
+        
+        Returns:
+            Updated reservation or None if it is not active (or does not exist)
+        """
+        values = {"status": new_status, "updated_at": func.now()}
+        if order_id is not None:
+            values["order_id"] = order_id
+        return self.db.execute(
+            update(StockReservation)
+            .where(StockReservation.id == reservation_id, StockReservation.status == "active")
+            .values(**values)
+            .returning(StockReservation)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).scalars().first()
+    
+    def confirm_many(self, order_ids: Dict[int, Optional[int]]) -> List[int]:
+        """
+        Confirm several active holds with one UPDATE
+        
+        Args:
+            order_ids: Reservation ID -> order ID (None keeps the current one)
+        
+        Returns:
+            IDs of the holds that were active and are now confirmed
+        """
+        values = {"status": "confirmed", "updated_at": func.now()}
+        new_order_ids = {rid: oid for rid, oid in order_ids.items() if oid is not None}
+        if new_order_ids:
+            values["order_id"] = case(new_order_ids, value=StockReservation.id, else_=StockReservation.order_id)
+        
+        return list(self.db.scalars(
+            update(StockReservation)
+            .where(StockReservation.id.in_(list(order_ids)), StockReservation.status == "active")
+            .values(**values)
+            .returning(StockReservation.id)
+            .execution_options(synchronize_session=False)
+        ))
+    
+    def release_expired(self, batch_size: int) -> List[Tuple[int, int]]:
+        """
+        Release up to batch_size expired holds
+        
+        Walks the partial index on active holds by expiry and skips rows
+        locked by another sweeper or a concurrent confirm.
+        
+        Returns:
+            (product_id, quantity) of every released hold
+        """
+        expired = (
+            select(StockReservation.id)
+            .where(StockReservation.status == "active", StockReservation.expires_at <= func.now())
+            .order_by(StockReservation.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return [tuple(row) for row in self.db.execute(
+            update(StockReservation)
+            .where(StockReservation.id.in_(expired.scalar_subquery()))
+            .values(status="released", updated_at=func.now())
+            .returning(StockReservation.product_id, StockReservation.quantity)
+            .execution_options(synchronize_session=False)
+        )]
@@ -0,0 +1,79 @@
+"""
+Row Count Repository - cheap totals for list endpoints
+"""
+from typing import Optional
+from sqlalchemy import select, update, delete, func, literal, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.row_count import RowCount
+
+
+class RowCountRepository:
+    """Repository for maintained row counters and planner estimates"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get(self, table_name: str) -> Optional[int]:
+        """Get maintained counter value (None if not seeded yet)"""
+        return self.db.execute(
+            select(RowCount.row_count).where(RowCount.table_name == table_name)
+        ).scalar()
+    
+    def increment(self, table_name: str, delta: int) -> None:
+        """
+        Adjust maintained counter
+        
+        Does not commit - runs inside the caller's transaction so the counter
+        changes atomically with the inserted/deleted rows. Only maintained
+        with COUNT_STRATEGY=counter: the UPDATE holds the counter row's lock
+        until commit, so it serializes concurrent writers.
+        """
+        if settings.COUNT_STRATEGY != "counter":
+            return
+        self.db.execute(
+            update(RowCount)
+            .where(RowCount.table_name == table_name)
+            .values(row_count=RowCount.row_count + delta)
+        )
+    
+    def seed(self, model) -> int:
+        """
+        Seed counter for model's table with an exact count (no-op if it exists)
+        
+        Returns:
+            Current counter value
+        """
+        table_name = model.__tablename__
+        self.db.execute(
+            insert(RowCount)
+            .from_select(
+                ["table_name", "row_count"],
+                select(literal(table_name), func.count()).select_from(model)
+            )
+            .on_conflict_do_nothing(index_elements=[RowCount.table_name])
+        )
+        self.db.commit()
+        return self.get(table_name)
+    
+    def drop(self, table_name: str) -> None:
+        """Delete counter, so the next seed() counts again"""
+        self.db.execute(delete(RowCount).where(RowCount.table_name == table_name))
+        self.db.commit()
+    
+    def estimate(self, table_name: str) -> Optional[int]:
+        """
+        Get planner row estimate from pg_class.reltuples
+        
+        Returns:
+            Estimated row count or None if the table was never analyzed
+        """
+        estimate = self.db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": table_name}
+        ).scalar()
+        if estimate is None or estimate < 0:
+            return None
+        return estimate
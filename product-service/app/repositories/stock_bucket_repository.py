@@ -0,0 +1,145 @@
+"""
+Stock Bucket Repository - striped inventory for hot products
+"""
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session, aliased
+
+from app.models.product import ProductStockBucket
+
+
+def bucket_totals_query(product_ids: Iterable[int]):
+    """Query returning (product_id, total stock) for striped products"""
+    return (
+        select(ProductStockBucket.product_id, func.sum(ProductStockBucket.stock))
+        .where(ProductStockBucket.product_id.in_(list(product_ids)))
+        .group_by(ProductStockBucket.product_id)
+    )
+
+
+class StockBucketRepository:
+    """
+    Repository for product stock buckets
+    
+    Write methods do not commit - they run inside the caller's transaction,
+    which should commit as soon as possible to release bucket row locks.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def totals(self, product_ids: Iterable[int]) -> Dict[int, int]:
+        """Get summed stock per product (products without buckets are omitted)"""
+        ids = list(product_ids)
+        if not ids:
+            return {}
+        return {product_id: int(total) for product_id, total in self.db.execute(bucket_totals_query(ids))}
+    
+    def change(self, product_id: int, quantity_change: int) -> Optional[int]:
+        """
+        Add or subtract stock on one of the product's buckets
+        
+        Picks a random bucket that is not locked by another transaction and
+        has enough stock, so concurrent decrements of the same product do
+        not wait for each other. If no such bucket exists (stock is spread
+        thin, or all candidates are busy), locks all buckets and drains them
+        in bucket order.
+        
+        Args:
+            product_id: Product ID
+            quantity_change: Positive to add, negative to subtract
+        
+        Returns:
+            New total stock, or None if the product has no buckets
+        
+        Raises:
+            ValueError: If total stock would become negative
+        """
+        required = max(-quantity_change, 0)
+        candidate = (
+            select(ProductStockBucket.bucket)
+            .where(ProductStockBucket.product_id == product_id, ProductStockBucket.stock >= required)
+            .order_by(func.random())
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        # Updated bucket plus the other buckets as of this statement's snapshot
+        other = aliased(ProductStockBucket)
+        other_buckets_stock = (
+            select(func.coalesce(func.sum(other.stock), 0))
+            .where(other.product_id == product_id, other.bucket != ProductStockBucket.bucket)
+            .scalar_subquery()
+        )
+        total = self.db.execute(
+            update(ProductStockBucket)
+            .where(ProductStockBucket.product_id == product_id, ProductStockBucket.bucket == candidate)
+            .values(stock=ProductStockBucket.stock + quantity_change)
+            .returning(ProductStockBucket.stock + other_buckets_stock)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        if total is not None:
+            return int(total)
+        
+        # Slow path: wait for all buckets (locked in bucket order to avoid deadlocks)
+        buckets = self._lock_all(product_id)
+        if not buckets:
+            return None
+        
+        total = sum(b.stock for b in buckets)
+        if total + quantity_change < 0:
+            raise ValueError(f"Insufficient stock. Current: {total}, requested change: {quantity_change}")
+        
+        if quantity_change >= 0:
+            buckets[0].stock += quantity_change
+        else:
+            remaining = required
+            for b in buckets:
+                taken = min(b.stock, remaining)
+                b.stock -= taken
+                remaining -= taken
+        self.db.flush()
+        return total + quantity_change
+    
+    def lock_total(self, product_id: int) -> Optional[int]:
+        """Lock all buckets of a product and return their sum (None if there are none)"""
+        buckets = self._lock_all(product_id)
+        if not buckets:
+            return None
+        return sum(b.stock for b in buckets)
+    
+    def stripe(self, product_id: int, bucket_count: int, total: int) -> None:
+        """
+        Spread total stock evenly over bucket_count buckets
+        
+        Existing buckets are updated in place (and extra ones deleted), so
+        transactions waiting on their locks see the new values.
+        
+        Args:
+            product_id: Product ID
+            bucket_count: Number of buckets (0 removes all buckets)
+            total: Total stock to distribute
+        """
+        existing = {b.bucket: b for b in self._lock_all(product_id)}
+        
+        for bucket in range(bucket_count):
+            share = total // bucket_count + (1 if bucket < total % bucket_count else 0)
+            row = existing.pop(bucket, None)
+            if row is None:
+                self.db.add(ProductStockBucket(product_id=product_id, bucket=bucket, stock=share))
+            else:
+                row.stock = share
+        
+        for row in existing.values():
+            self.db.delete(row)
+        self.db.flush()
+    
+    def _lock_all(self, product_id: int) -> list:
+        """SELECT ... FOR UPDATE all buckets of a product, ordered by bucket"""
+        return list(self.db.execute(
+            select(ProductStockBucket)
+            .where(ProductStockBucket.product_id == product_id)
+            .order_by(ProductStockBucket.bucket)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).scalars().all())
@@ -0,0 +1,92 @@
+"""
+Database schema version (Alembic revisions in migrations/)
+
+Migrations are applied once per deploy by migrate.py. API processes only
+compare the stamped revision with the one they were built for, which is a
+single query instead of catalog introspection in every worker.
+"""
+import os
+from functools import lru_cache
+from typing import List, Optional
+from alembic.script import ScriptDirectory
+from alembic.util.exc import CommandError
+from sqlalchemy import inspect, text
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+# Revision matching the schema the API created at startup before migrations (see migrate.py)
+BASELINE_REVISION = "0001"
+
+# Tables and columns of the baseline revision: a legacy database must have all of them to be stamped
+BASELINE_COLUMNS = {
+    "products": ["id", "name", "description", "price", "stock", "category", "image_url", "created_at", "updated_at"],
+    "processed_events": ["event_id", "event_type", "processed_at"],
+}
+
+
+class SchemaVersionError(RuntimeError):
+    """Database is not migrated to the revision this build needs"""
+    pass
+
+
+@lru_cache(maxsize=1)
+def _script() -> ScriptDirectory:
+    """Migration scripts of this build (loaded once)"""
+    return ScriptDirectory(MIGRATIONS_DIR)
+
+
+def head_revision() -> str:
+    """Latest revision of this build"""
+    return _script().get_current_head()
+
+
+def current_revision(connection) -> Optional[str]:
+    """Revision stamped in the database (None if it was never migrated)"""
+    if connection.execute(text("SELECT to_regclass('alembic_version')")).scalar() is None:
+        return None
+    return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def missing_baseline_columns(connection) -> List[str]:
+    """Baseline tables/columns absent from a database created without migrations ("table" or "table.column")"""
+    inspector = inspect(connection)
+    missing = []
+    for table, columns in BASELINE_COLUMNS.items():
+        if not inspector.has_table(table):
+            missing.append(table)
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        missing.extend(f"{table}.{column}" for column in columns if column not in existing)
+    return missing
+
+
+def check_schema_version(connection) -> str:
+    """
+    Verify the database is migrated far enough for this build
+    
+    A revision newer than this build knows about is accepted: migrations
+    stay backward compatible, so old processes keep serving during a
+    rolling deploy.
+    
+    Args:
+        connection: SQLAlchemy connection
+    
+    Returns:
+        Current revision
+    
+    Raises:
+        SchemaVersionError: If the database is not migrated or behind head
+    """
+    head = head_revision()
+    current = current_revision(connection)
+    if current == head:
+        return current
+    if current is None:
+        raise SchemaVersionError(f"Database is not migrated (expected revision {head}): run python migrate.py")
+    
+    try:
+        _script().get_revision(current)
+    except CommandError:
+        print(f"Warning: database schema revision {current} is newer than this build ({head})")
+        return current
+    raise SchemaVersionError(f"Database schema is at revision {current}, expected {head}: run python migrate.py")
\ No newline at end of file
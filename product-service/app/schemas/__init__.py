@@ -6,9 +6,21 @@ from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
     StockUpdate,
+    StockBucketsUpdate,
     ProductResponse,
     ProductListResponse,
-    StockCheckResponse
+    StockCheckResponse,
+    StockCheckItem,
+    ProductLookupRequest,
+    ProductLookupResponse,
+    ImportRowError,
+    ProductImportResponse
+)
+from app.schemas.reservation import (
+    ReservationItem,
+    ReservationCreate,
+    ReservationConfirm,
+    ReservationResponse
 )
 
 __all__ = [
@@ -16,7 +28,17 @@ __all__ = [
     "ProductCreate",
     "ProductUpdate",
     "StockUpdate",
+    "StockBucketsUpdate",
     "ProductResponse",
     "ProductListResponse",
-    "StockCheckResponse"
+    "StockCheckResponse",
+    "StockCheckItem",
+    "ProductLookupRequest",
+    "ProductLookupResponse",
+    "ImportRowError",
+    "ProductImportResponse",
+    "ReservationItem",
+    "ReservationCreate",
+    "ReservationConfirm",
+    "ReservationResponse"
 ]
\ No newline at end of file
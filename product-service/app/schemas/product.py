@@ -8,6 +8,7 @@ from datetime import datetime
 
 class ProductBase(BaseModel):
     """Base Product schema with common fields"""
+    sku: Optional[str] = Field(None, min_length=1, max_length=64, description="Stock keeping unit (unique)")
     name: str = Field(..., min_length=1, max_length=255, description="Product name")
     description: Optional[str] = Field(None, description="Product description")
     price: float = Field(..., gt=0, description="Product price (must be positive)")
@@ -23,6 +24,7 @@ class ProductCreate(ProductBase):
 
 class ProductUpdate(BaseModel):
     """Schema for updating a product (all fields optional)"""
+    sku: Optional[str] = Field(None, min_length=1, max_length=64)
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
     price: Optional[float] = Field(None, gt=0)
@@ -36,9 +38,15 @@ class StockUpdate(BaseModel):
     quantity: int = Field(..., description="Quantity to add (positive) or subtract (negative)")
 
 
+class StockBucketsUpdate(BaseModel):
+    """Schema for switching a product to/from striped stock"""
+    buckets: int = Field(..., ge=0, description="Number of stock buckets (0 disables striping)")
+
+
 class ProductResponse(ProductBase):
     """Schema for product response"""
     id: int
+    stock_buckets: int = Field(0, description="Number of stock buckets (0 if stock is not striped)")
     created_at: datetime
     updated_at: datetime
     
@@ -48,7 +56,28 @@ class ProductResponse(ProductBase):
 class ProductListResponse(BaseModel):
     """Schema for list of products response"""
     products: list[ProductResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Total count (None when COUNT_STRATEGY=none)")
+    has_more: bool = Field(False, description="Whether more products follow this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
+
+
+class CategoryStats(BaseModel):
+    """Schema for statistics of one category"""
+    category: Optional[str] = Field(None, description="Category (None for uncategorized products)")
+    product_count: int
+    total_stock: int
+    out_of_stock_count: int = Field(..., description="Products with no stock left")
+    min_price: float
+    avg_price: float
+    max_price: float
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CategoryStatsResponse(BaseModel):
+    """Schema for per-category catalog statistics"""
+    categories: list[CategoryStats]
+    refreshed_at: Optional[datetime] = Field(None, description="When the statistics were computed (None if there are no products)")
 
 
 class StockCheckResponse(BaseModel):
@@ -56,4 +85,34 @@ class StockCheckResponse(BaseModel):
     product_id: int
     available: bool
     stock: int
-    message: Optional[str] = None
\ No newline at end of file
+    message: Optional[str] = None
+
+
+class StockCheckItem(BaseModel):
+    """Schema for a single item of a batch stock check"""
+    product_id: int = Field(..., gt=0, description="Product ID")
+    quantity: int = Field(1, ge=1, description="Required quantity")
+
+
+class ProductLookupRequest(BaseModel):
+    """Schema for fetching several products by ID"""
+    ids: list[int] = Field(..., min_length=1, description="Product IDs to fetch")
+
+
+class ProductLookupResponse(BaseModel):
+    """Schema for bulk product fetch response"""
+    products: list[ProductResponse]
+    missing_ids: list[int] = Field(default_factory=list, description="Requested IDs that do not exist")
+
+
+class ImportRowError(BaseModel):
+    """Schema for a rejected import row"""
+    line: int = Field(..., description="Line number in the input (1-based)")
+    error: str
+
+
+class ProductImportResponse(BaseModel):
+    """Schema for bulk import result"""
+    accepted: int = Field(..., description="Products inserted or updated (a sku repeated within a chunk counts once)")
+    rejected: int = Field(..., description="Rows that failed validation or loading")
+    errors: list[ImportRowError] = Field(default_factory=list, description="First rejected rows with reasons")
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Pydantic schemas for stock reservations
+"""
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+class ReservationItem(BaseModel):
+    """Schema for a single product hold"""
+    product_id: int = Field(..., gt=0, description="Product ID")
+    quantity: int = Field(..., ge=1, description="Quantity to hold")
+
+
+class ReservationCreate(BaseModel):
+    """Schema for reserving stock (all items are held or none)"""
+    items: list[ReservationItem] = Field(..., min_length=1, description="Products and quantities to hold")
+    ttl_seconds: Optional[int] = Field(None, ge=1, description="Hold duration (default: RESERVATION_TTL_SECONDS)")
+
+
+class ReservationConfirm(BaseModel):
+    """Schema for confirming a reservation"""
+    order_id: Optional[int] = Field(None, gt=0, description="Order the hold was used for")
+
+
+class ReservationResponse(BaseModel):
+    """Schema for reservation response"""
+    id: int
+    product_id: int
+    quantity: int
+    status: str
+    order_id: Optional[int] = None
+    expires_at: datetime
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
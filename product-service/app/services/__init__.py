@@ -2,5 +2,9 @@
 Services package
 """
 from app.services.product_service import ProductService
+from app.services.async_product_service import AsyncProductService
+from app.services.product_import_service import ProductImporter
+from app.services.reservation_service import ReservationService
+from app.services.category_stats_service import CategoryStatsService
 
-__all__ = ["ProductService"]
\ No newline at end of file
+__all__ = ["ProductService", "AsyncProductService", "ProductImporter", "ReservationService", "CategoryStatsService"]
\ No newline at end of file
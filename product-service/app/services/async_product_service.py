@@ -0,0 +1,53 @@
+"""
+Async Product Service - Business Logic Layer (asyncpg)
+"""
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.async_product_repository import AsyncProductRepository
+from app.services.product_cache import product_cache
+from app.schemas.product import ProductResponse, StockCheckResponse
+
+
+class AsyncProductService:
+    """Async service layer for hot product read paths (GET /products/{id} and /check in async mode)"""
+    
+    def __init__(self, db: AsyncSession):
+        self.repository = AsyncProductRepository(db)
+    
+    async def get_product_by_id(self, product_id: int) -> Optional[ProductResponse]:
+        """Get product by ID (served from the in-process cache when possible)"""
+        cached = product_cache.get(product_id)
+        if cached is not None:
+            return cached
+        
+        token = product_cache.token()
+        product = await self.repository.get_by_id(product_id)
+        if not product:
+            return None
+        
+        response = ProductResponse.model_validate(product)
+        product_cache.set(product_id, response, token)
+        return response
+    
+    async def check_stock(self, product_id: int, required_quantity: int = 1) -> StockCheckResponse:
+        """Check if product has sufficient stock"""
+        product = await self.get_product_by_id(product_id)
+        
+        if not product:
+            return StockCheckResponse(
+                product_id=product_id,
+                available=False,
+                stock=0,
+                message="Product not found"
+            )
+        
+        available = product.stock >= required_quantity
+        message = None if available else f"Insufficient stock. Available: {product.stock}, Required: {required_quantity}"
+        
+        return StockCheckResponse(
+            product_id=product_id,
+            available=available,
+            stock=product.stock,
+            message=message
+        )
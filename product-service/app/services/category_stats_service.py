@@ -0,0 +1,43 @@
+"""
+Category Stats Service - catalog statistics per category
+"""
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.repositories.category_stats_repository import CategoryStatsRepository
+from app.schemas.product import CategoryStats, CategoryStatsResponse
+
+
+class CategoryStatsService:
+    """
+    Service layer for per-category catalog statistics
+    
+    Statistics are read from a materialized view refreshed every
+    CATEGORY_STATS_REFRESH_INTERVAL_SECONDS, so a request costs one row per
+    category however many products there are; they may lag writes by up to
+    one interval (see refreshed_at).
+    """
+    
+    def __init__(self, db: Session):
+        self.repository = CategoryStatsRepository(db)
+    
+    def get_stats(self) -> CategoryStatsResponse:
+        """Get statistics of every category"""
+        rows = self.repository.get_all()
+        return CategoryStatsResponse(
+            categories=[CategoryStats.model_validate(row) for row in rows],
+            refreshed_at=max((row.refreshed_at for row in rows), default=None)
+        )
+    
+    def refresh(self) -> bool:
+        """Recompute statistics (False if another process is refreshing them)"""
+        return self.repository.refresh()
+
+
+def refresh_category_stats() -> None:
+    """Refresh the category statistics view (run periodically by the API process)"""
+    db = SessionLocal()
+    try:
+        CategoryStatsService(db).refresh()
+    finally:
+        db.close()
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+In-memory front for the processed_events idempotency check (LRU) and its maintenance
+"""
+from collections import OrderedDict
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+from app.database import SessionLocal
+from app.repositories.product_repository import ProcessedEventRepository
+
+# Prometheus metrics (exposed by the consumer on CONSUMER_METRICS_PORT)
+EVENT_CHECKS = Counter(
+    "processed_event_checks_total",
+    "Idempotency checks by where they were answered",
+    ["source", "result"]  # source: lru | db, result: duplicate | new
+)
+TABLE_ROWS = Gauge("processed_events_rows", "Estimated rows in processed_events (pg_class.reltuples)")
+TABLE_BYTES = Gauge("processed_events_table_bytes", "Size of processed_events including indexes")
+PRUNED_EVENTS = Counter("processed_events_pruned_total", "Processed events deleted by retention pruning")
+
+
+class ProcessedEventFilter:
+    """
+    In-memory LRU of recently processed event IDs
+    
+    A hit is a certain duplicate (redeliveries arrive shortly after the
+    original), so the transaction is skipped entirely. Everything else goes
+    to the INSERT ... ON CONFLICT DO NOTHING into processed_events, which is
+    the authoritative check and costs no more than a SELECT would.
+    """
+    
+    def __init__(self, lru_size: int):
+        self.lru_size = lru_size
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+    
+    def check_recent(self, event_id: str) -> bool:
+        """Whether event is in the LRU of recently processed IDs (certain duplicate)"""
+        if event_id not in self._recent:
+            return False
+        self._recent.move_to_end(event_id)
+        EVENT_CHECKS.labels(source="lru", result="duplicate").inc()
+        return True
+    
+    def record_db_result(self, event_id: str, processed: bool) -> None:
+        """Count a check answered by the database (and remember duplicates)"""
+        EVENT_CHECKS.labels(source="db", result="duplicate" if processed else "new").inc()
+        if processed:
+            self.add(event_id)
+    
+    def add(self, event_id: str) -> None:
+        """Remember a processed event"""
+        self._recent[event_id] = None
+        self._recent.move_to_end(event_id)
+        while len(self._recent) > self.lru_size:
+            self._recent.popitem(last=False)
+
+
+# Global filter used by the consumer thread (not thread-safe)
+processed_event_filter = ProcessedEventFilter(lru_size=settings.EVENT_LRU_SIZE)
+
+
+def maintain_processed_events() -> None:
+    """
+    Prune processed_events past retention and refresh table metrics
+    
+    Run by the consumer at startup and every PROCESSED_EVENTS_PRUNE_INTERVAL_SECONDS.
+    """
+    db = SessionLocal()
+    try:
+        repository = ProcessedEventRepository(db)
+        pruned = repository.prune(
+            settings.PROCESSED_EVENTS_RETENTION_HOURS,
+            settings.PROCESSED_EVENTS_PRUNE_BATCH_SIZE
+        )
+        PRUNED_EVENTS.inc(pruned)
+        
+        rows, size = repository.table_stats()
+        if rows is not None:
+            TABLE_ROWS.set(rows)
+        TABLE_BYTES.set(size)
+        print(f"✓ processed_events: pruned {pruned} expired events")
+    finally:
+        db.close()
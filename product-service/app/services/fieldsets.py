@@ -0,0 +1,38 @@
+"""
+Sparse fieldsets for list endpoints (?fields=id,name,price)
+"""
+from typing import Optional, Sequence, Tuple
+
+
+class InvalidFieldsError(ValueError):
+    """Requested field is not in the endpoint's whitelist"""
+    pass
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated fields parameter against a whitelist
+    
+    Args:
+        fields: Raw query parameter (None or empty for all fields)
+        allowed: Fields the endpoint can return, in response order
+    
+    Returns:
+        None for all fields, otherwise the requested fields in response
+        order; "id" is always included
+    
+    Raises:
+        InvalidFieldsError: If a field is not in allowed
+    """
+    if not fields:
+        return None
+    
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise InvalidFieldsError(
+            f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(allowed)})"
+        )
+    
+    requested.add("id")
+    return tuple(name for name in allowed if name in requested)
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Opaque cursors for keyset pagination
+"""
+import base64
+import binascii
+import json
+from typing import Optional
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed or does not belong to the current query"""
+    pass
+
+
+def encode_cursor(last_id: int, category: Optional[str] = None) -> str:
+    """
+    Encode position after the last returned row into an opaque cursor
+    
+    Args:
+        last_id: ID of the last product on the current page
+        category: Category filter the page was produced with (if any)
+    
+    Returns:
+        URL-safe cursor string
+    """
+    payload = {"id": last_id}
+    if category is not None:
+        payload["category"] = category
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, category: Optional[str] = None) -> int:
+    """
+    Decode cursor back into the last seen product ID
+    
+    Args:
+        cursor: Cursor returned as next_cursor by a previous page
+        category: Category filter of the current request
+    
+    Returns:
+        Product ID to continue after
+    
+    Raises:
+        InvalidCursorError: If cursor is malformed or was issued for another category
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        last_id = int(payload["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Invalid cursor")
+    
+    if payload.get("category") != category:
+        raise InvalidCursorError("Cursor does not match the category filter")
+    
+    return last_id
@@ -0,0 +1,192 @@
+"""
+In-process product read cache (LRU + TTL) with cross-process invalidation
+"""
+import select
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+from app.database import engine, replica_urls
+from app.models.product import PRODUCT_CHANGED_CHANNEL
+from app.schemas.product import ProductResponse
+
+# Prometheus metrics (exposed on /metrics)
+CACHE_HITS = Counter("product_cache_hits_total", "Product cache hits")
+CACHE_MISSES = Counter("product_cache_misses_total", "Product cache misses")
+CACHE_EVICTIONS = Counter(
+    "product_cache_evictions_total",
+    "Product cache evictions",
+    ["reason"]  # size | expired | invalidated
+)
+CACHE_SIZE = Gauge("product_cache_size", "Number of cached products")
+
+
+class ProductCache:
+    """
+    Thread-safe LRU cache of ProductResponse objects with a TTL
+    
+    Readers take a token() before loading from the database and pass it to
+    set(). Any invalidation in between bumps the generation, and the stale
+    result is not cached.
+    
+    With read replicas, a read that starts after an invalidation can still
+    return the old row, so a product is not cached again until
+    stale_window_seconds (the maximum replica lag) after its invalidation.
+    """
+    
+    def __init__(self, max_size: int, ttl_seconds: float, stale_window_seconds: float = 0.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stale_window_seconds = stale_window_seconds
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._invalidated_at: "OrderedDict[int, float]" = OrderedDict()
+        self._cleared_at = float("-inf")
+        self._lock = threading.Lock()
+        self._generation = 0
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is enabled (max_size > 0)"""
+        return self.max_size > 0
+    
+    def token(self) -> int:
+        """Get current invalidation generation"""
+        return self._generation
+    
+    def get(self, product_id: int) -> Optional[ProductResponse]:
+        """Get cached product (None on miss or expiry)"""
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(product_id)
+            if entry is None:
+                CACHE_MISSES.inc()
+                return None
+            
+            expires_at, product = entry
+            if expires_at <= time.monotonic():
+                del self._entries[product_id]
+                CACHE_EVICTIONS.labels(reason="expired").inc()
+                CACHE_MISSES.inc()
+                CACHE_SIZE.set(len(self._entries))
+                return None
+            
+            self._entries.move_to_end(product_id)
+            CACHE_HITS.inc()
+            return product
+    
+    def set(self, product_id: int, product: ProductResponse, token: int) -> None:
+        """Cache product unless an invalidation happened since token() was taken"""
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            if token != self._generation:
+                return
+            if self.stale_window_seconds:
+                invalidated_at = max(self._invalidated_at.get(product_id, float("-inf")), self._cleared_at)
+                if time.monotonic() - invalidated_at < self.stale_window_seconds:
+                    return
+            
+            self._entries[product_id] = (time.monotonic() + self.ttl_seconds, product)
+            self._entries.move_to_end(product_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.labels(reason="size").inc()
+            CACHE_SIZE.set(len(self._entries))
+    
+    def invalidate(self, product_id: int) -> None:
+        """Drop a single product"""
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(product_id, None) is not None:
+                CACHE_EVICTIONS.labels(reason="invalidated").inc()
+                CACHE_SIZE.set(len(self._entries))
+            if self.stale_window_seconds:
+                self._remember_invalidation(product_id)
+    
+    def clear(self) -> None:
+        """Drop all products"""
+        with self._lock:
+            self._generation += 1
+            CACHE_EVICTIONS.labels(reason="invalidated").inc(len(self._entries))
+            self._entries.clear()
+            CACHE_SIZE.set(0)
+            self._cleared_at = time.monotonic()
+    
+    def _remember_invalidation(self, product_id: int) -> None:
+        """Record invalidation time, dropping records older than the stale window"""
+        now = time.monotonic()
+        self._invalidated_at[product_id] = now
+        self._invalidated_at.move_to_end(product_id)
+        while self._invalidated_at:
+            oldest_id, invalidated_at = next(iter(self._invalidated_at.items()))
+            if now - invalidated_at < self.stale_window_seconds:
+                break
+            del self._invalidated_at[oldest_id]
+
+
+class ProductCacheListener(threading.Thread):
+    """
+    Background thread that LISTENs for product changes
+    
+    The products table has an AFTER UPDATE/DELETE trigger that calls
+    pg_notify with the product ID. Changes made by other API workers and
+    by the order consumer therefore invalidate this process's cache too.
+    """
+    
+    def __init__(self, cache: ProductCache):
+        super().__init__(name="product-cache-listener", daemon=True)
+        self.cache = cache
+        self._stop_event = threading.Event()
+    
+    def stop(self):
+        """Signal the listener to exit"""
+        self._stop_event.set()
+    
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                print(f"✗ Product cache listener error: {e}")
+                self._stop_event.wait(1.0)
+    
+    def _listen(self):
+        # Dedicated connection, detached from the pool
+        raw = engine.raw_connection()
+        conn = raw.driver_connection
+        raw.detach()
+        try:
+            conn.rollback()
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {PRODUCT_CHANGED_CHANNEL}")
+            
+            # Notifications may have been missed while disconnected
+            self.cache.clear()
+            
+            while not self._stop_event.is_set():
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        self.cache.invalidate(int(notify.payload))
+                    except ValueError:
+                        self.cache.clear()
+        finally:
+            conn.close()
+
+
+# Global cache instance shared by sync and async services
+product_cache = ProductCache(
+    max_size=settings.PRODUCT_CACHE_MAX_SIZE if settings.PRODUCT_CACHE_ENABLED else 0,
+    ttl_seconds=settings.PRODUCT_CACHE_TTL_SECONDS,
+    stale_window_seconds=settings.REPLICA_MAX_LAG_SECONDS if replica_urls else 0.0
+)
@@ -0,0 +1,184 @@
+"""
+Product Import Service - streaming bulk import (NDJSON / CSV)
+"""
+import codecs
+import csv
+import json
+from typing import AsyncIterable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from anyio import from_thread
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product import ProductCreate, ProductImportResponse, ImportRowError
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+
+class ProductImporter:
+    """
+    Streaming product importer
+    
+    Consumes an iterator of input lines once. Valid rows are buffered and
+    upserted by sku every IMPORT_CHUNK_SIZE rows, so memory use does not
+    depend on input size.
+    """
+    
+    def __init__(self, db: Session, fmt: str = "ndjson", chunk_size: Optional[int] = None):
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+        
+        self.repository = ProductRepository(db)
+        self.db = db
+        self.fmt = fmt
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.accepted = 0
+        self.rejected = 0
+        self.errors: List[ImportRowError] = []
+        self._chunk: Dict[str, dict] = {}  # sku -> row (last occurrence wins)
+        self._chunk_lines: List[int] = []
+    
+    def run(self, lines: Iterable[str]) -> ProductImportResponse:
+        """
+        Import all lines and return the import summary
+        
+        Args:
+            lines: Input lines including their line endings (a CSV field
+                may span several lines)
+        """
+        records = self._csv_records(lines) if self.fmt == "csv" else self._ndjson_records(lines)
+        for line_number, data in records:
+            if isinstance(data, Exception):
+                self._reject(line_number, _error_message(data))
+                continue
+            
+            try:
+                row = self._validate(data)
+            except (ValueError, ValidationError) as e:
+                self._reject(line_number, _error_message(e))
+                continue
+            
+            self._chunk[row["sku"]] = row
+            self._chunk_lines.append(line_number)
+            if len(self._chunk) >= self.chunk_size:
+                self._flush()
+        
+        self._flush()
+        return ProductImportResponse(
+            accepted=self.accepted,
+            rejected=self.rejected,
+            errors=self.errors
+        )
+    
+    def _ndjson_records(self, lines: Iterable[str]) -> Iterator[Tuple[int, Union[dict, Exception]]]:
+        """(line number, field dict or parse error) per non-empty line"""
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield line_number, e
+                continue
+            if not isinstance(data, dict):
+                yield line_number, ValueError("Expected a JSON object")
+                continue
+            yield line_number, data
+    
+    def _csv_records(self, lines: Iterable[str]) -> Iterator[Tuple[int, Union[dict, Exception]]]:
+        """
+        (line number, field dict or parse error) per CSV record
+        
+        One reader runs over the whole input, so quoted fields may contain
+        newlines. The line number is the record's last line (reader.line_num).
+        """
+        reader = csv.reader(lines)
+        header = None
+        while True:
+            try:
+                values = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield reader.line_num, e
+                continue
+            
+            if not values:
+                continue
+            if header is None:
+                header = values
+                continue
+            if len(values) != len(header):
+                yield reader.line_num, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+                continue
+            # Empty CSV cells mean "not set"
+            yield reader.line_num, {key: value for key, value in zip(header, values) if value != ""}
+    
+    def _validate(self, data: dict) -> dict:
+        """Validate fields with the ProductCreate schema"""
+        product = ProductCreate.model_validate(data)
+        if not product.sku:
+            raise ValueError("sku is required for import")
+        return product.model_dump()
+    
+    def _flush(self) -> None:
+        """Upsert buffered rows in one statement"""
+        if not self._chunk:
+            return
+        
+        rows = list(self._chunk.values())
+        lines = self._chunk_lines
+        self._chunk = {}
+        self._chunk_lines = []
+        
+        try:
+            self.repository.upsert_many(rows)
+            # A sku repeated within the chunk was upserted once
+            self.accepted += len(rows)
+        except Exception as e:
+            self.db.rollback()
+            for line_number in lines:
+                self._reject(line_number, f"Chunk failed: {e}")
+    
+    def _reject(self, line_number: int, error: str) -> None:
+        """Record rejected row (details kept for the first IMPORT_MAX_ERRORS)"""
+        self.rejected += 1
+        if len(self.errors) < settings.IMPORT_MAX_ERRORS:
+            self.errors.append(ImportRowError(line=line_number, error=error))
+
+
+def iter_body_lines(chunks: AsyncIterable[bytes]) -> Iterator[str]:
+    """
+    Lines (with their line endings) of a streamed UTF-8 body, for a worker thread
+    
+    Each body chunk is awaited in the event loop through anyio.from_thread,
+    so iterate it only in a thread started by run_in_threadpool.
+    
+    Args:
+        chunks: Raw body chunks (e.g. request.stream())
+    """
+    iterator = chunks.__aiter__()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    
+    while True:
+        try:
+            data = from_thread.run(iterator.__anext__)
+        except StopAsyncIteration:
+            break
+        pending += decoder.decode(data)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line + "\n"
+    
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _error_message(error: Exception) -> str:
+    """Short, single-line description of a row error"""
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" for e in error.errors())
+    return str(error)
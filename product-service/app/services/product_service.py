@@ -1,59 +1,238 @@
 """
 Product Service - Business Logic Layer
 """
-from typing import List, Optional
+from collections import defaultdict
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.repositories.product_repository import ProductRepository, ProcessedEventRepository
+from app.repositories.product_core_repository import ProductCoreRepository
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.total_counter import TotalCounter
+from app.services.product_cache import product_cache
+from app.services.reservation_service import ReservationService
+from app.services.event_filter import processed_event_filter
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
     ProductListResponse,
-    StockCheckResponse
+    StockCheckResponse,
+    StockCheckItem,
+    ProductLookupResponse
 )
 from app.models.product import Product
 
+# ProductResponse fields, copied straight from database rows on the fast JSON path
+# (also the whitelist for ?fields=)
+PRODUCT_FIELDS = tuple(ProductResponse.model_fields)
+
+# Columns every list page loads: the cursor and striped stock need them
+PAGE_KEY_FIELDS = ("id", "stock_buckets")
+
+# Fields changed by stock writes (UPDATE of stock also sets updated_at)
+STOCK_FIELDS = ("stock", "updated_at")
+
+
+def product_to_dict(product: Product, fields: Sequence[str] = PRODUCT_FIELDS) -> dict:
+    """ProductResponse-shaped dict (optionally only some fields) of a trusted database row (not validated)"""
+    if isinstance(product, Row):
+        return {field: product._mapping[field] for field in fields}
+    # Loaded attributes are read from the instance dict, skipping the ORM
+    # descriptors; expired ones are loaded through getattr
+    state = product.__dict__
+    return {field: state[field] if field in state else getattr(product, field) for field in fields}
+
 
 class ProductService:
     """Service layer for product business logic"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, read_path: Optional[str] = None):
+        """
+        Args:
+            db: Database session
+            read_path: Repository for read-only queries, "core" or "orm"
+                (default: PRODUCT_READ_PATH); writes always use the ORM
+        """
+        self.db = db
         self.repository = ProductRepository(db)
-        self.event_repository = ProcessedEventRepository(db)
+        self.read_repository = (
+            ProductCoreRepository(db) if (read_path or settings.PRODUCT_READ_PATH) == "core" else self.repository
+        )
+        self.event_repository = ProcessedEventRepository(db, processed_event_filter)
+        self.total_counter = TotalCounter(db, Product)
+        self.reservation_service = ReservationService(db)
     
-    def get_all_products(self, skip: int = 0, limit: int = 100) -> ProductListResponse:
-        """Get all products with pagination"""
-        products = self.repository.get_all(skip=skip, limit=limit)
-        total = self.repository.count()
+    def get_products_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        category: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> dict:
+        """
+        Get products with pagination, as a plain dict for FastJSONResponse
+        
+        Uses keyset pagination when a cursor is given, otherwise skip/limit.
+        Both modes order by ID, so next_cursor from an offset page can be
+        used to continue with keyset pages.
+        
+        Rows are copied into dicts instead of being validated into models,
+        which dominates the cost of large pages. With fields, only those
+        columns (plus PAGE_KEY_FIELDS) are selected and returned.
+        
+        Args:
+            fields: Fields to return (None: all), see parse_fields
+        
+        Raises:
+            InvalidCursorError: If cursor is malformed or issued for another category
+        """
+        columns = None if fields is None else tuple(dict.fromkeys(PAGE_KEY_FIELDS + tuple(fields)))
+        products, total, has_more, next_cursor = self._load_page(skip, limit, cursor, category, columns)
+        return {
+            "products": [product_to_dict(p, fields or PRODUCT_FIELDS) for p in products],
+            "total": total,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }
+    
+    def get_catalog_version(self, fields: Optional[Sequence[str]] = None) -> Tuple[int, Optional[int]]:
+        """
+        Catalog version for list page ETags (one query over a few rows)
+        
+        Read before the page on the same session, so the page is never
+        older than the version. List totals from COUNT_STRATEGY=cached or
+        estimated may change without a new version.
+        
+        Args:
+            fields: Fields of the page (None: all)
+        
+        Returns:
+            (version, stock version or None when the fields include none of
+            STOCK_FIELDS, so stock writes do not change the ETag)
+        """
+        version, stock_version = self.repository.catalog_version()
+        if fields is not None and not set(fields) & set(STOCK_FIELDS):
+            stock_version = None
+        return version, stock_version
+    
+    def _load_page(
+        self,
+        skip: int,
+        limit: int,
+        cursor: Optional[str],
+        category: Optional[str],
+        columns: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Product], Optional[int], bool, Optional[str]]:
+        """Load a list page: (products, total, has_more, next_cursor)"""
+        if cursor is not None:
+            after_id = decode_cursor(cursor, category)
+            products = self.read_repository.get_page(after_id=after_id, limit=limit + 1, category=category, columns=columns)
+        else:
+            products = self.read_repository.get_all(skip=skip, limit=limit + 1, category=category, columns=columns)
+        
+        has_more = len(products) > limit
+        products = products[:limit]
+        next_cursor = encode_cursor(products[-1].id, category) if has_more else None
+        total = self.total_counter.get_total(
+            lambda: self.repository.count(category=category),
+            filter_key=category
+        )
+        return products, total, has_more, next_cursor
+    
+    def search_products(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> ProductListResponse:
+        """
+        Full-text product search ranked by relevance
+        
+        Total is not computed (has_more tells whether another page exists).
+        """
+        products = self.repository.search(
+            query,
+            category=category,
+            min_price=min_price,
+            max_price=max_price,
+            skip=skip,
+            limit=limit + 1
+        )
         
         return ProductListResponse(
-            products=[ProductResponse.model_validate(p) for p in products],
-            total=total
+            products=[ProductResponse.model_validate(p) for p in products[:limit]],
+            total=None,
+            has_more=len(products) > limit
         )
     
     def get_product_by_id(self, product_id: int) -> Optional[ProductResponse]:
-        """Get product by ID"""
-        product = self.repository.get_by_id(product_id)
+        """Get product by ID (served from the in-process cache when possible)"""
+        cached = product_cache.get(product_id)
+        if cached is not None:
+            return cached
+        
+        token = product_cache.token()
+        product = self.read_repository.get_by_id(product_id)
         if not product:
             return None
-        return ProductResponse.model_validate(product)
+        
+        response = ProductResponse.model_validate(product)
+        product_cache.set(product_id, response, token)
+        return response
+    
+    def get_products_by_ids(self, product_ids: List[int]) -> ProductLookupResponse:
+        """
+        Get several products with a single query
+        
+        Args:
+            product_ids: Product IDs (duplicates are ignored)
+        
+        Returns:
+            Found products in request order plus IDs that do not exist
+        """
+        unique_ids = list(dict.fromkeys(product_ids))
+        products = {p.id: p for p in self.read_repository.get_by_ids(unique_ids)}
+        
+        return ProductLookupResponse(
+            products=[ProductResponse.model_validate(products[pid]) for pid in unique_ids if pid in products],
+            missing_ids=[pid for pid in unique_ids if pid not in products]
+        )
     
     def create_product(self, product_data: ProductCreate) -> ProductResponse:
-        """Create new product"""
+        """
+        Create new product
+        
+        Raises:
+            ValueError: If sku is already used by another product
+        """
         product = self.repository.create(product_data)
         return ProductResponse.model_validate(product)
     
     def update_product(self, product_id: int, product_data: ProductUpdate) -> Optional[ProductResponse]:
-        """Update existing product"""
+        """
+        Update existing product
+        
+        Raises:
+            ValueError: If sku is already used by another product
+        """
         product = self.repository.update(product_id, product_data)
+        product_cache.invalidate(product_id)
         if not product:
             return None
         return ProductResponse.model_validate(product)
     
     def delete_product(self, product_id: int) -> bool:
         """Delete product"""
-        return self.repository.delete(product_id)
+        deleted = self.repository.delete(product_id)
+        product_cache.invalidate(product_id)
+        return deleted
     
     def update_stock(self, product_id: int, quantity_change: int) -> Optional[ProductResponse]:
         """
@@ -73,14 +252,54 @@ class ProductService:
             product = self.repository.update_stock(product_id, quantity_change)
             if not product:
                 return None
+            product_cache.invalidate(product_id)
             return ProductResponse.model_validate(product)
         except ValueError as e:
             raise e
     
+    def set_stock_buckets(self, product_id: int, bucket_count: int) -> Optional[ProductResponse]:
+        """
+        Enable, resize or disable striped stock for a product
+        
+        With N buckets, concurrent decrements of the product lock different
+        rows. Reads and update_stock/check_stock stay the same for callers.
+        
+        Args:
+            product_id: Product ID
+            bucket_count: Number of buckets (0 disables striping)
+        
+        Returns:
+            Updated product or None
+        """
+        product = self.repository.set_stock_buckets(product_id, bucket_count)
+        product_cache.invalidate(product_id)
+        if not product:
+            return None
+        return ProductResponse.model_validate(product)
+    
     def check_stock(self, product_id: int, required_quantity: int = 1) -> StockCheckResponse:
         """Check if product has sufficient stock"""
-        product = self.repository.get_by_id(product_id)
+        product = self.get_product_by_id(product_id)
+        return self._build_stock_check(product_id, required_quantity, product)
+    
+    def check_stock_batch(self, items: List[StockCheckItem]) -> List[StockCheckResponse]:
+        """
+        Check stock for several products with a single query
         
+        Args:
+            items: Product IDs with required quantities
+        
+        Returns:
+            One stock check result per item, in request order
+        """
+        products = {p.id: p for p in self.read_repository.get_by_ids({item.product_id for item in items})}
+        return [
+            self._build_stock_check(item.product_id, item.quantity, products.get(item.product_id))
+            for item in items
+        ]
+    
+    def _build_stock_check(self, product_id: int, required_quantity: int, product) -> StockCheckResponse:
+        """Build stock check result for a loaded product or cached response (None if not found)"""
         if not product:
             return StockCheckResponse(
                 product_id=product_id,
@@ -103,16 +322,25 @@ class ProductService:
         """
         Process OrderCreated event from RabbitMQ
         
+        The idempotency record and the stock change are written in one
+        transaction with a single commit: either both happen or neither,
+        so a crash or redelivery can never apply an event twice.
+        
+        Orders placed with a stock reservation only confirm the hold (stock
+        was already taken); older events without one, or whose hold no
+        longer exists, decrement stock.
+        
         Args:
             event_data: Event data containing event_id, order_id, product_id, quantity
+                and optionally reservation_id
         
         Returns:
-            True if processed successfully, False otherwise
+            True if processed successfully (or already processed), False otherwise
         """
         event_id = event_data.get("event_id")
         
-        # Check idempotency
-        if self.event_repository.is_processed(event_id):
+        # Redeliveries of recently processed events are caught in memory
+        if self.event_repository.is_recently_processed(event_id):
             print(f"Event {event_id} already processed. Skipping.")
             return True
         
@@ -121,27 +349,113 @@ class ProductService:
         product_id = order_data.get("product_id")
         quantity = order_data.get("quantity")
         
-        if not product_id or not quantity:
+        if not event_id or not product_id or not quantity:
             print(f"Invalid event data: {event_data}")
             return False
         
         try:
-            # Update stock (subtract quantity)
-            product = self.repository.update_stock(product_id, -quantity)
+            # Idempotency record first: a duplicate stops here
+            if not self.event_repository.mark_processed(event_id, event_data.get("event_type", "OrderCreated"), commit=False):
+                self.db.rollback()
+                print(f"Event {event_id} already processed. Skipping.")
+                return True
+            
+            reservation_id = order_data.get("reservation_id")
+            if reservation_id is not None:
+                if self.reservation_service.confirm(reservation_id, order_data.get("order_id"), commit=False):
+                    self.db.commit()
+                    self.event_repository.remember(event_id)
+                    print(f"✓ Reservation {reservation_id} confirmed for product {product_id}")
+                    return True
+                # The order exists, so its stock is still taken: decrement directly
+                print(f"Warning: Reservation {reservation_id} not found, decrementing stock directly")
             
+            # Update stock (subtract quantity)
+            product = self.repository.update_stock(product_id, -quantity, commit=False)
             if not product:
+                self.db.rollback()
                 print(f"Product {product_id} not found")
                 return False
             
-            # Mark event as processed
-            self.event_repository.mark_processed(event_id, event_data.get("event_type", "OrderCreated"))
+            self.db.commit()
+            self.event_repository.remember(event_id)
+            product_cache.invalidate(product_id)
             
             print(f"✓ Stock updated for product {product_id}: {product.stock + quantity} → {product.stock}")
             return True
             
         except ValueError as e:
+            self.db.rollback()
             print(f"✗ Error updating stock: {e}")
             return False
         except Exception as e:
+            self.db.rollback()
             print(f"✗ Unexpected error processing event: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def process_order_created_batch(self, events: List[dict]) -> int:
+        """
+        Apply a batch of OrderCreated events in one transaction
+        
+        Event IDs are deduplicated (within the batch, in memory and with one
+        INSERT into processed_events). Decrements are summed per product, so
+        a burst of orders for one product costs a single UPDATE; reservations
+        are confirmed with one statement.
+        
+        Args:
+            events: Parsed OrderCreated events
+        
+        Returns:
+            Number of newly applied events (the rest were duplicates)
+        
+        Raises:
+            ValueError: If any event is invalid or cannot be applied. Nothing is
+                committed then; the caller should fall back to
+                process_order_created_event for each event.
+        """
+        unique_events = {}
+        for event in events:
+            event_id = event.get("event_id")
+            order_data = event.get("data", {})
+            if not event_id or not order_data.get("product_id") or not order_data.get("quantity"):
+                raise ValueError(f"Invalid event data: {event}")
+            if event_id not in unique_events and not self.event_repository.is_recently_processed(event_id):
+                unique_events[event_id] = event
+        
+        if not unique_events:
+            return 0
+        
+        decrements = defaultdict(int)
+        try:
+            new_ids = self.event_repository.mark_processed_many(
+                [(event_id, event.get("event_type", "OrderCreated")) for event_id, event in unique_events.items()]
+            )
+            
+            confirmations = {}
+            for event_id in new_ids:
+                order_data = unique_events[event_id]["data"]
+                if order_data.get("reservation_id") is not None:
+                    confirmations[order_data["reservation_id"]] = order_data.get("order_id")
+                else:
+                    decrements[order_data["product_id"]] += order_data["quantity"]
+            
+            if confirmations:
+                confirmed = self.reservation_service.repository.confirm_many(confirmations)
+                if len(confirmed) != len(confirmations):
+                    raise ValueError(f"{len(confirmations) - len(confirmed)} reservations are no longer active")
+            
+            # Lock products in ID order so concurrent batches cannot deadlock
+            for product_id in sorted(decrements):
+                if not self.repository.update_stock(product_id, -decrements[product_id], commit=False):
+                    raise ValueError(f"Product {product_id} not found")
+            
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        for event_id in new_ids:
+            self.event_repository.remember(event_id)
+        for product_id in decrements:
+            product_cache.invalidate(product_id)
+        return len(new_ids)
\ No newline at end of file
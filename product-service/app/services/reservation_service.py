@@ -0,0 +1,205 @@
+"""
+Reservation Service - stock holds with TTL
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.repositories.product_repository import ProductRepository
+from app.repositories.reservation_repository import ReservationRepository
+from app.services.product_cache import product_cache
+from app.schemas.reservation import ReservationItem, ReservationResponse
+
+
+class ProductNotFoundError(ValueError):
+    """Reserved product does not exist"""
+    pass
+
+
+class ReservationService:
+    """
+    Service layer for stock reservations
+    
+    Reserving takes the stock right away, so /check and every other stock
+    read already account for active holds. Confirming keeps the stock taken;
+    releasing (explicitly or on expiry) gives it back.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = ReservationRepository(db)
+        self.product_repository = ProductRepository(db)
+    
+    def reserve(self, items: List[ReservationItem], ttl_seconds: Optional[int] = None) -> List[ReservationResponse]:
+        """
+        Hold stock for several products in one transaction (all or nothing)
+        
+        Args:
+            items: Products and quantities to hold
+            ttl_seconds: Hold duration (default: RESERVATION_TTL_SECONDS)
+        
+        Returns:
+            One active reservation per item, in request order
+        
+        Raises:
+            ProductNotFoundError: If a product does not exist
+            ValueError: If a product has insufficient stock
+        """
+        quantities = _sum_by_product((item.product_id, item.quantity) for item in items)
+        
+        try:
+            # Lock products in ID order so concurrent batches cannot deadlock
+            for product_id in sorted(quantities):
+                product = self.product_repository.update_stock(product_id, -quantities[product_id], commit=False)
+                if not product:
+                    raise ProductNotFoundError(f"Product with id={product_id} not found")
+            
+            reservations = self.repository.create_many(
+                [item.model_dump() for item in items],
+                ttl_seconds or settings.RESERVATION_TTL_SECONDS
+            )
+            response = [ReservationResponse.model_validate(r) for r in reservations]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self._invalidate(quantities)
+        return response
+    
+    def get_reservation(self, reservation_id: int) -> Optional[ReservationResponse]:
+        """Get reservation by ID"""
+        reservation = self.repository.get_by_id(reservation_id)
+        if not reservation:
+            return None
+        return ReservationResponse.model_validate(reservation)
+    
+    def confirm(self, reservation_id: int, order_id: Optional[int] = None, commit: bool = True) -> Optional[ReservationResponse]:
+        """
+        Confirm a hold (the stock stays taken)
+        
+        Confirming twice is a no-op. A hold that was already released (e.g. it
+        expired before the order arrived) takes the stock again if possible.
+        
+        Args:
+            reservation_id: Reservation ID
+            order_id: Order the hold was used for
+            commit: Commit immediately (False to compose with other writes)
+        
+        Returns:
+            Confirmed reservation or None if not found
+        
+        Raises:
+            ValueError: If the hold was released and stock is no longer available
+        """
+        try:
+            reservation = self.repository.finish(reservation_id, "confirmed", order_id)
+            if not reservation:
+                reservation = self.repository.get_by_id(reservation_id, for_update=True)
+                if not reservation:
+                    return None
+                if reservation.status == "released":
+                    product = self.product_repository.update_stock(reservation.product_id, -reservation.quantity, commit=False)
+                    if not product:
+                        raise ValueError(f"Product with id={reservation.product_id} no longer exists")
+                    reservation.status = "confirmed"
+                    self._invalidate({reservation.product_id: reservation.quantity})
+                if order_id is not None:
+                    reservation.order_id = order_id
+                self.db.flush()
+            response = ReservationResponse.model_validate(reservation)
+            if commit:
+                self.db.commit()
+        except Exception:
+            if commit:
+                self.db.rollback()
+            raise
+        
+        return response
+    
+    def release(self, reservation_id: int) -> Optional[ReservationResponse]:
+        """
+        Release a hold and return its stock (no-op if already released)
+        
+        Returns:
+            Released reservation or None if not found
+        
+        Raises:
+            ValueError: If the reservation is already confirmed
+        """
+        try:
+            reservation = self.repository.finish(reservation_id, "released")
+            if reservation:
+                self.product_repository.update_stock(reservation.product_id, reservation.quantity, commit=False)
+            else:
+                reservation = self.repository.get_by_id(reservation_id)
+                if not reservation:
+                    return None
+                if reservation.status == "confirmed":
+                    raise ValueError(f"Reservation {reservation_id} is already confirmed")
+            response = ReservationResponse.model_validate(reservation)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self._invalidate({reservation.product_id: reservation.quantity})
+        return response
+    
+    def release_expired(self, batch_size: Optional[int] = None) -> int:
+        """
+        Release all expired holds, one batch per transaction
+        
+        Stock is returned with one update per product per batch, so a flash
+        sale leaving thousands of abandoned holds costs a few statements.
+        
+        Args:
+            batch_size: Holds per transaction (default: RESERVATION_SWEEP_BATCH_SIZE)
+        
+        Returns:
+            Number of released holds
+        """
+        batch_size = batch_size or settings.RESERVATION_SWEEP_BATCH_SIZE
+        released = 0
+        
+        while True:
+            try:
+                holds = self.repository.release_expired(batch_size)
+                quantities = _sum_by_product(holds)
+                for product_id in sorted(quantities):
+                    self.product_repository.update_stock(product_id, quantities[product_id], commit=False)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            
+            self._invalidate(quantities)
+            released += len(holds)
+            if len(holds) < batch_size:
+                return released
+    
+    def _invalidate(self, quantities: Dict[int, int]) -> None:
+        """Drop changed products from the read cache"""
+        for product_id in quantities:
+            product_cache.invalidate(product_id)
+
+
+def _sum_by_product(holds) -> Dict[int, int]:
+    """Sum (product_id, quantity) pairs per product"""
+    quantities = defaultdict(int)
+    for product_id, quantity in holds:
+        quantities[product_id] += quantity
+    return quantities
+
+
+def sweep_expired_reservations() -> None:
+    """Release expired holds (run periodically by the API process)"""
+    db = SessionLocal()
+    try:
+        released = ReservationService(db).release_expired()
+        if released:
+            print(f"✓ Released {released} expired stock reservations")
+    finally:
+        db.close()
@@ -0,0 +1,94 @@
+"""
+Total count strategies for list endpoints
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.repositories.row_count_repository import RowCountRepository
+
+# Process-wide TTL cache: key -> (expires_at, total)
+_cache: Dict[str, Tuple[float, int]] = {}
+_cache_lock = threading.Lock()
+
+
+class TotalCounter:
+    """
+    Resolves list totals according to COUNT_STRATEGY
+    
+    - exact: SELECT count(*) on every request
+    - cached: exact count cached for COUNT_CACHE_TTL_SECONDS
+    - estimated: pg_class.reltuples planner estimate
+    - counter: row counter maintained by create/delete paths
+    - none: total is omitted (clients use has_more)
+    """
+    
+    def __init__(self, db: Session, model):
+        self.row_counts = RowCountRepository(db)
+        self.model = model
+        self.table_name = model.__tablename__
+    
+    def get_total(self, exact_count: Callable[[], int], filter_key: Optional[str] = None) -> Optional[int]:
+        """
+        Get total for a list query
+        
+        Args:
+            exact_count: Runs the exact count for the query
+            filter_key: Identifies a filtered query. Counters and estimates only
+                cover the whole table, so filtered totals use the TTL cache.
+        
+        Returns:
+            Total count or None when COUNT_STRATEGY=none
+        """
+        strategy = settings.COUNT_STRATEGY
+        if strategy == "none":
+            return None
+        if strategy == "exact":
+            return exact_count()
+        if strategy == "cached" or filter_key is not None:
+            return self._cached(exact_count, filter_key)
+        if strategy == "estimated":
+            estimate = self.row_counts.estimate(self.table_name)
+            if estimate is not None:
+                return estimate
+            return self._cached(exact_count, filter_key)
+        
+        # strategy == "counter"
+        total = self.row_counts.get(self.table_name)
+        if total is None:
+            total = self.row_counts.seed(self.model)
+        return total
+    
+    def _cached(self, exact_count: Callable[[], int], filter_key: Optional[str]) -> int:
+        """Exact count cached with a TTL"""
+        key = f"{self.table_name}:{filter_key}"
+        now = time.monotonic()
+        with _cache_lock:
+            cached = _cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        total = exact_count()
+        with _cache_lock:
+            _cache[key] = (now + settings.COUNT_CACHE_TTL_SECONDS, total)
+        return total
+
+
+def drop_unmaintained_counter(model) -> None:
+    """
+    Drop the table's row counter unless COUNT_STRATEGY=counter (run at startup)
+    
+    Other strategies do not maintain it, so after running with one of them
+    the counter is stale; dropped, it is seeded again with an exact count
+    on first use in counter mode.
+    """
+    if settings.COUNT_STRATEGY == "counter":
+        return
+    db = SessionLocal()
+    try:
+        RowCountRepository(db).drop(model.__tablename__)
+    finally:
+        db.close()
\ No newline at end of file
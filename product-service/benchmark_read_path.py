@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Benchmark the work behind GET /products/{id}/check on the ORM and Core read paths
+
+Each iteration does what the endpoint does per request (session,
+ProductService, check_stock, close) with the product read cache disabled,
+so every check queries the database. HTTP handling is left out: it costs
+the same on both paths. Needs DATABASE_URL; a temporary product is created
+and deleted.
+
+Usage:
+    python benchmark_read_path.py
+    python benchmark_read_path.py --requests 5000
+"""
+import argparse
+import time
+
+from app.database import SessionLocal
+from app.schemas.product import ProductCreate
+from app.services.product_cache import product_cache
+from app.services.product_service import ProductService
+
+
+def check(read_path: str, product_id: int) -> None:
+    db = SessionLocal()
+    try:
+        ProductService(db, read_path=read_path).check_stock(product_id)
+    finally:
+        db.close()
+
+
+def measure(read_path: str, product_id: int, requests: int):
+    """Wall-clock and CPU milliseconds per request"""
+    for _ in range(100):  # warm up (statement caches, connection pool)
+        check(read_path, product_id)
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(requests):
+        check(read_path, product_id)
+    return (time.perf_counter() - wall) / requests * 1000, (time.process_time() - cpu) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ORM vs Core read path")
+    parser.add_argument("--requests", type=int, default=3000, help="Checks per read path")
+    args = parser.parse_args()
+    
+    product_cache.max_size = 0
+    
+    db = SessionLocal()
+    try:
+        product_id = ProductService(db).create_product(
+            ProductCreate(name="benchmark_read_path", price=1.0, stock=10)
+        ).id
+        try:
+            results = {path: measure(path, product_id, args.requests) for path in ("orm", "core")}
+        finally:
+            ProductService(db).delete_product(product_id)
+    finally:
+        db.close()
+    
+    print(f"Stock check, {args.requests} requests per path, cache disabled:")
+    for path, (wall, cpu) in results.items():
+        print(f"  {path + ':':5} {wall:.3f} ms/request ({cpu:.3f} ms CPU)")
+    print(f"  core is {results['orm'][1] / results['core'][1]:.2f}x cheaper in CPU")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
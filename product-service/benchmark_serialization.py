@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Benchmark CPU time to serialize one GET /products page
+
+Compares the response_model path (model_validate per row, FastAPI
+re-validation, jsonable_encoder, json.dumps) with the fast path
+(product_to_dict + FastJSONResponse). No database needed.
+
+Usage:
+    python benchmark_serialization.py
+    python benchmark_serialization.py --items 1000 --rounds 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.responses import FastJSONResponse
+from app.models.product import Product
+from app.schemas.product import ProductResponse, ProductListResponse
+from app.services.product_service import product_to_dict
+
+
+def make_products(count: int):
+    """Detached Product rows with realistic field sizes"""
+    now = datetime.now(timezone.utc)
+    return [
+        Product(
+            id=i,
+            sku=f"SKU-{i:08d}",
+            name=f"Product {i}",
+            description="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 3,
+            price=19.99 + i,
+            stock=i % 500,
+            stock_buckets=0,
+            category="electronics",
+            image_url=f"https://cdn.example.com/products/{i}.jpg",
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def response_model_path(products, field) -> bytes:
+    page = ProductListResponse(
+        products=[ProductResponse.model_validate(p) for p in products],
+        total=len(products),
+        has_more=True,
+        next_cursor="cursor"
+    )
+    content = asyncio.run(serialize_response(field=field, response_content=page, is_coroutine=False))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(products, field) -> bytes:
+    page = {
+        "products": [product_to_dict(p) for p in products],
+        "total": len(products),
+        "has_more": True,
+        "next_cursor": "cursor"
+    }
+    return FastJSONResponse(page).body
+
+
+def measure(fn, products, field, rounds: int) -> float:
+    """CPU milliseconds per page"""
+    fn(products, field)  # warm up
+    start = time.process_time()
+    for _ in range(rounds):
+        fn(products, field)
+    return (time.process_time() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark product list serialization")
+    parser.add_argument("--items", type=int, default=1000, help="Products per page")
+    parser.add_argument("--rounds", type=int, default=20, help="Pages serialized per path")
+    args = parser.parse_args()
+    
+    products = make_products(args.items)
+    field = create_response_field(name="response", type_=ProductListResponse)
+    
+    if json.loads(response_model_path(products, field)) != json.loads(fast_path(products, field)):
+        raise SystemExit("✗ Fast path output differs from response_model output")
+    
+    before = measure(response_model_path, products, field, args.rounds)
+    after = measure(fast_path, products, field, args.rounds)
+    print(f"{args.items}-item page, CPU per page:")
+    print(f"  response_model + JSONResponse: {before:.2f} ms")
+    print(f"  product_to_dict + orjson:      {after:.2f} ms ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
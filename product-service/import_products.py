@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Script to bulk import products from an NDJSON or CSV file
+
+Usage:
+    python import_products.py products.ndjson
+    python import_products.py products.csv --chunk-size 5000
+"""
+import argparse
+import sys
+from itertools import islice
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.product_import_service import ProductImporter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import products (upsert by sku)")
+    parser.add_argument("path", help="Input file ('-' for stdin)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="Input format (default: from file extension)")
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE, help="Rows per upsert statement")
+    args = parser.parse_args()
+    
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8", newline="")
+    
+    db = SessionLocal()
+    try:
+        importer = ProductImporter(db, fmt, chunk_size=args.chunk_size)
+        while True:
+            lines = list(islice(source, args.chunk_size))
+            if not lines:
+                break
+            importer.feed(lines)
+            print(f"… {importer.accepted} accepted, {importer.rejected} rejected", file=sys.stderr)
+        
+        result = importer.finish()
+    finally:
+        db.close()
+        source.close()
+    
+    print(f"✓ Import finished: {result.accepted} accepted, {result.rejected} rejected")
+    for error in result.errors:
+        print(f"✗ Line {error.line}: {error.error}")
+    sys.exit(1 if result.rejected else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""baseline schema
+
+Schema of the products and processed_events tables as the API created them
+at startup (init_db, create_all) before any later feature. Databases created
+that way are stamped at this revision by migrate.py; every later revision
+skips objects that exist, because init_db also created them on databases
+set up after the feature was added.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 21:28:28.099058
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('processed_events',
+    sa.Column('event_id', sa.String(length=100), nullable=False),
+    sa.Column('event_type', sa.String(length=100), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    op.create_table('products',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price', sa.Float(), nullable=False),
+    sa.Column('stock', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint('price >= 0', name='check_price_positive'),
+    sa.CheckConstraint('stock >= 0', name='check_stock_non_negative'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_products_category'), 'products', ['category'], unique=False)
+    op.create_index(op.f('ix_products_id'), 'products', ['id'], unique=False)
+    op.create_index(op.f('ix_products_name'), 'products', ['name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_products_name'), table_name='products')
+    op.drop_index(op.f('ix_products_id'), table_name='products')
+    op.drop_index(op.f('ix_products_category'), table_name='products')
+    op.drop_table('products')
+    op.drop_table('processed_events')
\ No newline at end of file
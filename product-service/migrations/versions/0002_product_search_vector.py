@@ -0,0 +1,41 @@
+"""product search vector
+
+Full-text search document and GIN index for GET /products/search.
+Databases created by init_db after search was added already have them and
+are stamped at the baseline, so existing objects are skipped. Adding the
+generated column rewrites the products table.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:12:41.530214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('products')}
+    if 'search_vector' not in columns:
+        op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+            f"setweight(to_tsvector('{settings.SEARCH_TEXT_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{settings.SEARCH_TEXT_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True
+        ), nullable=True))
+    op.create_index('ix_products_search_vector', 'products', ['search_vector'], unique=False, postgresql_using='gin', if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_search_vector', table_name='products', postgresql_using='gin')
+    op.drop_column('products', 'search_vector')
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""product sku
+
+Natural key used by the bulk import upsert (INSERT ... ON CONFLICT (sku)).
+Databases created by init_db after imports were added already have the
+column and are stamped at the baseline, so it is skipped there.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:26:05.118937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('products')}
+    if 'sku' not in columns:
+        op.add_column('products', sa.Column('sku', sa.String(length=64), nullable=True))
+        op.create_unique_constraint('products_sku_key', 'products', ['sku'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('products_sku_key', 'products', type_='unique')
+    op.drop_column('products', 'sku')
\ No newline at end of file
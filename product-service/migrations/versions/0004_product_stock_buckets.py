@@ -0,0 +1,59 @@
+"""product stock buckets
+
+Striped stock for hot products: products.stock_buckets, the bucket rows
+and their change notification trigger (read cache invalidation).
+Databases created by init_db after striping was added already have them
+and are stamped at the baseline, so existing objects are skipped.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:41:17.662390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'stock_buckets' not in {column['name'] for column in inspector.get_columns('products')}:
+        op.add_column('products', sa.Column('stock_buckets', sa.Integer(), server_default='0', nullable=False))
+        op.create_check_constraint('check_stock_buckets_non_negative', 'products', 'stock_buckets >= 0')
+    if not inspector.has_table('product_stock_buckets'):
+        op.create_table('product_stock_buckets',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.Integer(), nullable=False),
+        sa.Column('stock', sa.Integer(), nullable=False),
+        sa.CheckConstraint('stock >= 0', name='check_bucket_stock_non_negative'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id', 'bucket')
+        )
+    
+    op.execute("""
+    CREATE OR REPLACE FUNCTION notify_product_stock_bucket_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('product_changed', OLD.product_id::text);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE OR REPLACE TRIGGER product_stock_buckets_notify_changed
+    AFTER UPDATE ON product_stock_buckets
+    FOR EACH ROW EXECUTE FUNCTION notify_product_stock_bucket_changed()
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('product_stock_buckets')
+    op.execute("DROP FUNCTION notify_product_stock_bucket_changed()")
+    op.drop_constraint('check_stock_buckets_non_negative', 'products', type_='check')
+    op.drop_column('products', 'stock_buckets')
\ No newline at end of file
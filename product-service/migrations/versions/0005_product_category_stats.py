@@ -0,0 +1,51 @@
+"""product category stats
+
+Materialized view behind GET /products/stats. It sums stock buckets, so it
+follows revision 0004. The unique index is required by REFRESH ...
+CONCURRENTLY (NULLS NOT DISTINCT so the uncategorized row is covered too).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 09:44:52.207165
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS product_category_stats AS
+    SELECT
+        p.category,
+        count(*) AS product_count,
+        sum(coalesce(b.stock, p.stock)) AS total_stock,
+        count(*) FILTER (WHERE coalesce(b.stock, p.stock) = 0) AS out_of_stock_count,
+        min(p.price) AS min_price,
+        avg(p.price) AS avg_price,
+        max(p.price) AS max_price,
+        now() AS refreshed_at
+    FROM products p
+    LEFT JOIN (
+        SELECT product_id, sum(stock) AS stock
+        FROM product_stock_buckets
+        GROUP BY product_id
+    ) b ON b.product_id = p.id AND p.stock_buckets > 0
+    GROUP BY p.category
+    """)
+    op.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_product_category_stats_category
+    ON product_category_stats (category) NULLS NOT DISTINCT
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW product_category_stats")
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""product category id index
+
+Composite index for keyset pagination within a category (GET /products
+with category and cursor). Skipped where init_db already created it.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 10:02:13.480125
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_products_category_id', 'products', ['category', 'id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_category_id', table_name='products')
\ No newline at end of file
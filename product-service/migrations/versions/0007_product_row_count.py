@@ -0,0 +1,39 @@
+"""product row count
+
+Maintained row counter (COUNT_STRATEGY=counter). The products counter is
+seeded with the exact count, so databases that already hold products
+start correct; an existing table or counter is kept.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 10:04:37.905512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('row_counts'):
+        op.create_table('row_counts',
+        sa.Column('table_name', sa.String(length=100), nullable=False),
+        sa.Column('row_count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('table_name')
+        )
+    op.execute("""
+    INSERT INTO row_counts (table_name, row_count)
+    SELECT 'products', count(*) FROM products
+    ON CONFLICT (table_name) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('row_counts')
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""product change trigger
+
+Notifies listeners about every updated or deleted product row (read
+cache invalidation). Stock bucket changes are notified by the trigger of
+revision 0004.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 10:06:58.316044
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+    CREATE OR REPLACE FUNCTION notify_product_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('product_changed', OLD.id::text);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE OR REPLACE TRIGGER products_notify_changed
+    AFTER UPDATE OR DELETE ON products
+    FOR EACH ROW EXECUTE FUNCTION notify_product_changed()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER products_notify_changed ON products")
+    op.execute("DROP FUNCTION notify_product_changed()")
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""processed events processed_at index
+
+Index used by retention pruning of processed_events. Skipped where
+init_db already created it.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 10:11:45.028861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_processed_events_processed_at'), 'processed_events', ['processed_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_processed_events_processed_at'), table_name='processed_events')
\ No newline at end of file
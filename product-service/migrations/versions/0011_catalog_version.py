@@ -0,0 +1,66 @@
+"""catalog version
+
+Version of the whole catalog, read before a GET /products page to answer
+If-None-Match without running the page query. It is split over 16 shard
+rows, and a writer bumps the shard of its connection. Deferred constraint
+triggers bump it once per transaction, at commit, so the row lock is held
+only while committing and is always the writer's last lock. The bump is
+transactional, so a reader never sees a version newer than the data.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 10:52:36.204718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('catalog_version',
+    sa.Column('shard', sa.SmallInteger(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('shard')
+    )
+    op.execute("INSERT INTO catalog_version (shard, version) SELECT generate_series(0, 15), 0")
+    
+    op.execute("""
+    CREATE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+    BEGIN
+        -- Fires for every changed row at commit; only the first one bumps
+        IF current_setting('catalog.version_bumped', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        PERFORM set_config('catalog.version_bumped', 'on', true);
+        UPDATE catalog_version SET version = version + 1 WHERE shard = pg_backend_pid() % 16;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE CONSTRAINT TRIGGER products_bump_catalog_version
+    AFTER INSERT OR UPDATE OR DELETE ON products
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION bump_catalog_version()
+    """)
+    op.execute("""
+    CREATE CONSTRAINT TRIGGER product_stock_buckets_bump_catalog_version
+    AFTER INSERT OR UPDATE OR DELETE ON product_stock_buckets
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION bump_catalog_version()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER product_stock_buckets_bump_catalog_version ON product_stock_buckets")
+    op.execute("DROP TRIGGER products_bump_catalog_version ON products")
+    op.execute("DROP FUNCTION bump_catalog_version()")
+    op.drop_table('catalog_version')
\ No newline at end of file
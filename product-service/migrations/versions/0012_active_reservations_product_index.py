@@ -0,0 +1,28 @@
+"""active reservations product index
+
+Partial index on the product of active holds, used by imports to take
+held stock out of the imported stock value.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 09:14:32.508217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_stock_reservations_active_product_id', 'stock_reservations', ['product_id'], unique=False, postgresql_where=sa.text("status = 'active'"), if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stock_reservations_active_product_id', table_name='stock_reservations', postgresql_where=sa.text("status = 'active'"))
\ No newline at end of file
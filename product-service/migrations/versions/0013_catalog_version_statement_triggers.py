@@ -0,0 +1,109 @@
+"""catalog version statement triggers
+
+Replaces the per-row deferred triggers of 0011, which queued one trigger
+event per changed row and bumped the list version on every stock change.
+Statement triggers bump at most once per transaction and counter: product
+edits, inserts and deletes bump version, stock changes (products.stock and
+stock buckets) bump the new stock_version, so list pages without stock
+fields stay cacheable under order traffic. A bump takes a shard no other
+writer holds (SKIP LOCKED), so writers never wait on each other.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 11:02:47.316594
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('catalog_version', sa.Column('stock_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.execute("DROP TRIGGER product_stock_buckets_bump_catalog_version ON product_stock_buckets")
+    op.execute("DROP TRIGGER products_bump_catalog_version ON products")
+    
+    op.execute("""
+    CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+    DECLARE
+        counter text := TG_ARGV[0];  -- version | stock_version
+        free_shard smallint;
+    BEGIN
+        IF current_setting('catalog.' || counter || '_bumped', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        PERFORM set_config('catalog.' || counter || '_bumped', 'on', true);
+        
+        -- Prefer the connection's shard, skip shards other writers hold
+        SELECT shard INTO free_shard FROM catalog_version
+        ORDER BY (shard - pg_backend_pid() % 16 + 16) % 16
+        LIMIT 1 FOR UPDATE SKIP LOCKED;
+        IF free_shard IS NULL THEN
+            free_shard := pg_backend_pid() % 16;
+        END IF;
+        EXECUTE format('UPDATE catalog_version SET %1$I = %1$I + 1 WHERE shard = $1', counter) USING free_shard;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE TRIGGER products_bump_catalog_version
+    AFTER INSERT OR DELETE ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version('version')
+    """)
+    op.execute("""
+    CREATE TRIGGER products_update_bump_catalog_version
+    AFTER UPDATE OF name, description, price, category, image_url, sku, stock_buckets ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version('version')
+    """)
+    op.execute("""
+    CREATE TRIGGER products_bump_stock_version
+    AFTER UPDATE OF stock ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version('stock_version')
+    """)
+    op.execute("""
+    CREATE TRIGGER product_stock_buckets_bump_stock_version
+    AFTER INSERT OR UPDATE OR DELETE ON product_stock_buckets
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version('stock_version')
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER product_stock_buckets_bump_stock_version ON product_stock_buckets")
+    op.execute("DROP TRIGGER products_bump_stock_version ON products")
+    op.execute("DROP TRIGGER products_update_bump_catalog_version ON products")
+    op.execute("DROP TRIGGER products_bump_catalog_version ON products")
+    
+    op.execute("""
+    CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+    BEGIN
+        -- Fires for every changed row at commit; only the first one bumps
+        IF current_setting('catalog.version_bumped', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        PERFORM set_config('catalog.version_bumped', 'on', true);
+        UPDATE catalog_version SET version = version + 1 WHERE shard = pg_backend_pid() % 16;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE CONSTRAINT TRIGGER products_bump_catalog_version
+    AFTER INSERT OR UPDATE OR DELETE ON products
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION bump_catalog_version()
+    """)
+    op.execute("""
+    CREATE CONSTRAINT TRIGGER product_stock_buckets_bump_catalog_version
+    AFTER INSERT OR UPDATE OR DELETE ON product_stock_buckets
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION bump_catalog_version()
+    """)
+    op.drop_column('catalog_version', 'stock_version')
\ No newline at end of file
@@ -1,8 +1,34 @@
 #!/usr/bin/env python
 """
 Script to run RabbitMQ consumer for Product Service
+
+Usage:
+    python run_consumer.py                  # single consumer on the shared queue
+    python run_consumer.py --partitions 4   # one worker process per product partition
 """
-from app.consumers.order_consumer import start_consumer
+import argparse
+
+from app.config import settings
+from app.consumers import start_consumer, start_async_consumer, run_partitioned_consumers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consume OrderCreated events")
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=settings.CONSUMER_PARTITIONS,
+        help="Partition events by product_id across N worker processes (0: shared queue)"
+    )
+    args = parser.parse_args()
+    
+    if args.partitions > 0:
+        run_partitioned_consumers(args.partitions)
+    elif settings.CONSUMER_MODE == "async":
+        start_async_consumer()
+    else:
+        start_consumer()
+
 
 if __name__ == "__main__":
-    start_consumer()
\ No newline at end of file
+    main()
\ No newline at end of file
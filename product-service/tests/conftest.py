@@ -0,0 +1,75 @@
+"""
+Shared test fixtures
+
+Database tests run against DATABASE_URL (migrated with migrate.py) and are
+skipped when it is unreachable. Every test creates its own products and
+deletes them afterwards.
+"""
+import uuid
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.database import SessionLocal, engine
+from app.models.product import Product, ProcessedEvent
+from app.schemas.product import ProductCreate
+from app.services.event_filter import processed_event_filter
+from app.services.product_service import ProductService
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Skip the test if the migrated database is not available"""
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1 FROM products LIMIT 0"))
+    except DBAPIError as e:
+        pytest.skip(f"Database not available: {e.orig}")
+
+
+@pytest.fixture
+def db(database):
+    """Database session"""
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def make_product(db):
+    """Create products for one test (deleted on teardown)"""
+    created = []
+    
+    def make(stock: int = 10, **fields) -> int:
+        fields.setdefault("name", f"Test product {uuid.uuid4().hex[:8]}")
+        fields.setdefault("price", 9.99)
+        product = ProductService(db).create_product(ProductCreate(stock=stock, **fields))
+        created.append(product.id)
+        return product.id
+    
+    yield make
+    db.rollback()
+    db.query(Product).filter(Product.id.in_(created)).delete(synchronize_session=False)
+    db.commit()
+
+
+@pytest.fixture
+def order_event(db):
+    """Build OrderCreated events (their processed_events rows are deleted on teardown)"""
+    event_ids = []
+    
+    def make(product_id: int, quantity: int, **data) -> dict:
+        event_id = str(uuid.uuid4())
+        event_ids.append(event_id)
+        return {
+            "event_id": event_id,
+            "event_type": "OrderCreated",
+            "data": {"order_id": 1, "product_id": product_id, "quantity": quantity, **data}
+        }
+    
+    yield make
+    for event_id in event_ids:
+        processed_event_filter._recent.pop(event_id, None)
+    db.rollback()
+    db.query(ProcessedEvent).filter(ProcessedEvent.event_id.in_(event_ids)).delete(synchronize_session=False)
+    db.commit()
\ No newline at end of file
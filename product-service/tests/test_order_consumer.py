@@ -0,0 +1,50 @@
+"""
+Tests for the batching OrderCreated consumer
+"""
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call
+
+from app.consumers.order_consumer import BatchConsumer
+from app.services.product_service import ProductService
+
+
+def deliver(consumer: BatchConsumer, events: list) -> None:
+    """Buffer events as deliveries with tags 1..n"""
+    for tag, event in enumerate(events, start=1):
+        consumer.on_message(consumer.channel, SimpleNamespace(delivery_tag=tag), None, json.dumps(event))
+
+
+def test_batch_is_acked_at_once(db, make_product, order_event):
+    product_id = make_product(stock=10)
+    consumer = BatchConsumer(MagicMock(), MagicMock(), batch_size=3, max_wait_ms=1000)
+    
+    deliver(consumer, [order_event(product_id, 1), order_event(product_id, 2), order_event(product_id, 3)])
+    
+    consumer.channel.basic_ack.assert_called_once_with(delivery_tag=3, multiple=True)
+    consumer.channel.basic_nack.assert_not_called()
+    assert ProductService(db).get_product_by_id(product_id).stock == 4
+
+
+def test_bad_message_falls_back_to_one_by_one(db, make_product, order_event):
+    product_id = make_product(stock=10)
+    consumer = BatchConsumer(MagicMock(), MagicMock(), batch_size=3, max_wait_ms=1000)
+    
+    # The second order exceeds stock, so the batch as a whole cannot be applied
+    deliver(consumer, [order_event(product_id, 2), order_event(product_id, 50), order_event(product_id, 3)])
+    
+    assert consumer.channel.basic_ack.call_args_list == [call(delivery_tag=1), call(delivery_tag=3)]
+    consumer.channel.basic_nack.assert_called_once_with(delivery_tag=2, requeue=False)
+    assert ProductService(db).get_product_by_id(product_id).stock == 5
+
+
+def test_invalid_json_is_rejected_and_the_rest_applied(db, make_product, order_event):
+    product_id = make_product(stock=10)
+    consumer = BatchConsumer(MagicMock(), MagicMock(), batch_size=2, max_wait_ms=1000)
+    
+    consumer.on_message(consumer.channel, SimpleNamespace(delivery_tag=1), None, b"{not json")
+    consumer.on_message(consumer.channel, SimpleNamespace(delivery_tag=2), None, json.dumps(order_event(product_id, 4)))
+    
+    consumer.channel.basic_nack.assert_called_once_with(delivery_tag=1, requeue=False)
+    consumer.channel.basic_ack.assert_called_once_with(delivery_tag=2, multiple=True)
+    assert ProductService(db).get_product_by_id(product_id).stock == 6
\ No newline at end of file
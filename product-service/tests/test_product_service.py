@@ -0,0 +1,92 @@
+"""
+Tests for ProductService and the layers below it
+"""
+import uuid
+import pytest
+
+from app.services.pagination import InvalidCursorError, encode_cursor, decode_cursor
+from app.models.product import ProcessedEvent
+from app.repositories.product_repository import ProductRepository
+from app.services.event_filter import processed_event_filter
+from app.services.product_service import ProductService
+
+
+# Keyset pagination
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert decode_cursor(encode_cursor(42, "books"), "books") == 42
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(10 ** 12, "a/b+c")
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(1)[:-2] + "!!", "eyJmb28iOjF9"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_cursor_of_another_category_is_rejected():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor(5, "books"), "games")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor(5, "books"))
+
+
+def test_cursor_pages_return_every_product_once(db, make_product):
+    category = f"test-{uuid.uuid4().hex[:8]}"
+    ids = [make_product(category=category) for _ in range(5)]
+    service = ProductService(db)
+    
+    seen = []
+    page = service.get_products_page(limit=2, category=category)
+    seen += [p["id"] for p in page["products"]]
+    while page["next_cursor"]:
+        page = service.get_products_page(limit=2, cursor=page["next_cursor"], category=category)
+        seen += [p["id"] for p in page["products"]]
+    
+    assert seen == sorted(ids)
+    assert page["has_more"] is False
+
+# Conditional stock update
+
+def test_update_stock_returns_new_stock(db, make_product):
+    product_id = make_product(stock=5)
+    product = ProductRepository(db).update_stock(product_id, -3)
+    assert product.stock == 2
+
+
+def test_insufficient_stock_updates_no_row(db, make_product):
+    product_id = make_product(stock=2)
+    repository = ProductRepository(db)
+    
+    with pytest.raises(ValueError, match="Insufficient stock"):
+        repository.update_stock(product_id, -3)
+    db.rollback()
+    
+    assert repository.get_by_id(product_id).stock == 2
+
+
+def test_update_stock_of_unknown_product_returns_none(db):
+    assert ProductRepository(db).update_stock(2 ** 31 - 1, -1) is None
+
+
+# Idempotent event processing
+
+def test_duplicate_event_is_skipped(db, make_product, order_event):
+    product_id = make_product(stock=10)
+    event = order_event(product_id, 3)
+    service = ProductService(db)
+    
+    assert service.process_order_created_event(event) is True
+    # Redelivery caught by the in-memory LRU
+    assert service.process_order_created_event(event) is True
+    # Redelivery after a restart (LRU empty) caught by processed_events
+    processed_event_filter._recent.pop(event["event_id"])
+    assert service.process_order_created_event(event) is True
+    
+    assert service.get_product_by_id(product_id).stock == 7
+    assert db.query(ProcessedEvent).filter(ProcessedEvent.event_id == event["event_id"]).count() == 1
\ No newline at end of file
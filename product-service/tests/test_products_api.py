@@ -0,0 +1,28 @@
+"""
+Tests for the /products API
+"""
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.pagination import encode_cursor
+
+# Without the context manager startup (readiness, background tasks) does not run
+client = TestClient(app)
+
+
+# Keyset pagination
+
+def test_malformed_cursor_returns_400():
+    response = client.get("/products", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_cursor_of_another_category_returns_400():
+    response = client.get("/products", params={"cursor": encode_cursor(5, "books"), "category": "games"})
+    assert response.status_code == 400
+
+
+def test_malformed_cursor_is_never_not_modified():
+    response = client.get("/products", params={"cursor": "not-a-cursor"}, headers={"If-None-Match": "*"})
+    assert response.status_code == 400
\ No newline at end of file